@@ -0,0 +1,62 @@
+"""
+Headless HTTP API over the property search backend
+Run: python api_server.py [--host 127.0.0.1] [--port 8000] [--workers N] [--processes N] [--data-dir data]
+
+Loads the catalogue once, then serves /search, /stats, /expand, /metrics
+and /health (see backend/api.py), e.g.
+
+    curl 'http://127.0.0.1:8000/search?q=2BHK+in+Pune+under+1.5+Cr'
+
+With --processes N the catalogue is published to shared memory and N
+worker processes attach to it and accept on the same port (see
+backend/cluster.py).
+"""
+
+import argparse
+import asyncio
+import logging
+
+from backend.api import SearchAPI
+from backend.cluster import ServerCluster
+from backend.data_loader import DataLoader
+from backend.logs import configure_logging
+from backend.metrics import Metrics
+from backend.search_engine import SearchIndex
+from backend.service import SearchService
+
+
+def load_index(data_dir):
+    """Search index of the catalogue; the loaded frame is released once it is built"""
+    return SearchIndex(DataLoader(data_dir=data_dir).get_data())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Property search HTTP API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='search threads per process, one per CPU by default (1 with --processes)')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes sharing one catalogue')
+    parser.add_argument('--max-pending', type=int, default=None, help='queued requests before answering 503')
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--debug', action='store_true', help='log every query')
+    args = parser.parse_args()
+
+    level = logging.DEBUG if args.debug else logging.INFO
+    configure_logging(level)
+    if args.processes:
+        cluster = ServerCluster(load_index(args.data_dir), args.processes, args.host, args.port,
+                                threads=args.workers or 1, max_pending=args.max_pending, level=level)
+        cluster.serve_forever()
+        return
+
+    service = SearchService.from_data(args.data_dir, metrics=Metrics())
+    api = SearchAPI(service, workers=args.workers, max_pending=args.max_pending)
+    try:
+        asyncio.run(api.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
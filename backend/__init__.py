@@ -2,9 +2,15 @@
 Backend package for Property Search Chatbot
 """
 
+from .api import SearchAPI
 from .data_loader import DataLoader
+from .logs import configure_logging
 from .query_parser import QueryParser
 from .search_engine import SearchEngine
+from .service import SearchService
 from .summarizer import Summarizer
 
-__all__ = ['DataLoader', 'QueryParser', 'SearchEngine', 'Summarizer']
+__all__ = [
+    'DataLoader', 'QueryParser', 'SearchAPI', 'SearchEngine', 'SearchService', 'Summarizer',
+    'configure_logging',
+]
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from .service import FILTER_TYPES, json_ready
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted, and how long an idle keep-alive connection stays open
+MAX_BODY_BYTES = 64 * 1024
+KEEPALIVE_SECONDS = 15
+
+JSON_TYPE = 'application/json'
+PROMETHEUS_TYPE = 'text/plain; version=0.0.4'
+
+
+class HTTPError(Exception):
+    """A request that gets an error response instead of a result"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class Response:
+    """Status, headers and body of one response"""
+
+    def __init__(self, status, body=b'', content_type=JSON_TYPE, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = {'Content-Type': content_type, **(headers or {})}
+
+    @classmethod
+    def json(cls, status, data, headers=None):
+        body = json.dumps(json_ready(data), ensure_ascii=False).encode()
+        return cls(status, body, headers=headers)
+
+    def decoded(self):
+        """The body parsed as JSON"""
+        return json.loads(self.body)
+
+
+class SearchAPI:
+    """
+    HTTP front end of a SearchService on an asyncio event loop
+
+    The event loop only parses requests and writes responses; parsing,
+    search and card formatting run on a bounded thread pool so a slow
+    query never stalls other connections. When more than `max_pending`
+    requests are already waiting for the pool, new ones are turned away
+    with 503 instead of queueing without limit.
+
+    Endpoints (GET with query-string parameters, or POST with a JSON body):
+        /search   q, top_n, filter overrides  -> summary, stats and cards
+        /stats    q, facets, filter overrides -> facet counts of all matches
+        /expand   q, top_n, filter overrides  -> expand_search() results
+        /metrics                              -> Prometheus text
+        /health                               -> catalogue rows and version
+    """
+
+    def __init__(self, service, workers=None, max_pending=None):
+        self.service = service
+        self.metrics = service.metrics
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending if max_pending is not None else self.workers * 16
+        self.pending = 0
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='search')
+        self.routes = {
+            '/search': self._search,
+            '/stats': self._stats,
+            '/expand': self._expand,
+            '/metrics': self._metrics,
+            '/health': self._health,
+        }
+
+    async def respond(self, method, target, body=b''):
+        """
+        Response to one request, the part shared by the server and TestClient
+
+        Args:
+            method (str): HTTP method
+            target (str): Path with an optional query string
+            body (bytes): Request body, JSON for POST
+        """
+        start = time.perf_counter()
+        url = urlsplit(target)
+        route = url.path if url.path in self.routes else 'unknown'
+        try:
+            if route == 'unknown':
+                raise HTTPError(HTTPStatus.NOT_FOUND)
+            if method not in ('GET', 'POST'):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            params = self._params(method, url.query, body)
+            response = await self.routes[url.path](params)
+        except HTTPError as error:
+            response = Response.json(error.status, {'error': str(error)})
+        except Exception:
+            logger.exception("Failed to handle %s %s", method, target)
+            response = Response.json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal Server Error'})
+        self.metrics.observe('request_seconds', time.perf_counter() - start,
+                             route=route, status=int(response.status))
+        return response
+
+    async def _run(self, function, *args):
+        """Run a blocking service call on the pool, or refuse when it is saturated"""
+        if self.pending >= self.max_pending:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, 'Too many pending requests')
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+        except (ValueError, re.error) as error:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(error)) from None
+        finally:
+            self.pending -= 1
+
+    async def _search(self, params):
+        query, overrides = self._query(params)
+        data = await self._run(self.service.search, query, overrides, params.get('top_n', 10))
+        return Response.json(HTTPStatus.OK, data)
+
+    async def _stats(self, params):
+        query, overrides = self._query(params)
+        facets = params.get('facets')
+        if isinstance(facets, str):
+            facets = [name for name in facets.split(',') if name]
+        data = await self._run(self.service.stats, query, overrides, facets)
+        return Response.json(HTTPStatus.OK, data)
+
+    async def _expand(self, params):
+        query, overrides = self._query(params)
+        data = await self._run(self.service.expand, query, overrides, params.get('top_n', 10))
+        return Response.json(HTTPStatus.OK, data)
+
+    async def _metrics(self, params):
+        return Response(HTTPStatus.OK, self.metrics.to_prometheus().encode(), PROMETHEUS_TYPE)
+
+    async def _health(self, params):
+        return Response.json(HTTPStatus.OK, self.service.health())
+
+    @staticmethod
+    def _params(method, query_string, body):
+        """Query-string parameters, overlaid with the JSON object of a POST body"""
+        params = dict(parse_qsl(query_string))
+        if method == 'POST' and body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'Body is not valid JSON') from None
+            if not isinstance(data, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, 'Body must be a JSON object')
+            params.update(data)
+        return params
+
+    @staticmethod
+    def _query(params):
+        """(free-text query, explicit filters) of a request"""
+        query = params.get('q') or params.get('query')
+        if query is not None and not isinstance(query, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'q must be a string')
+        filters = params.get('filters') or {}
+        if not isinstance(filters, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'filters must be a JSON object')
+        overrides = dict(filters)
+        overrides.update({name: params[name] for name in FILTER_TYPES if name in params})
+        return query, overrides
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEPALIVE_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    # Idle, cut off, or a header line beyond the stream limit
+                    break
+                except HTTPError as error:
+                    await self._write(writer, Response.json(error.status, {'error': str(error)}), False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                response = await self.respond(method, target, body)
+                await self._write(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """(method, target, version, headers, body), or None at end of stream"""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'Malformed request line') from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'Invalid Content-Length') from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b''
+        return method, target, version, headers, body
+
+    @staticmethod
+    async def _write(writer, response, keep_alive):
+        status = HTTPStatus(response.status)
+        headers = {
+            **response.headers,
+            'Content-Length': str(len(response.body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + response.body)
+        await writer.drain()
+
+    async def start(self, host='127.0.0.1', port=8000, sock=None):
+        """Start listening, on host:port or on an already bound socket"""
+        if sock is not None:
+            server = await asyncio.start_server(self.handle_connection, sock=sock)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        for bound in server.sockets:
+            logger.info("Serving on %s:%s with %d search workers", *bound.getsockname()[:2], self.workers)
+        return server
+
+    async def serve(self, host='127.0.0.1', port=8000, sock=None):
+        """Serve until cancelled"""
+        server = await self.start(host, port, sock)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TestClient:
+    """
+    Calls a SearchAPI in-process, without sockets
+
+    Requests go through the same routing, pool and serialization as over
+    HTTP, so scripts and tests see exactly what a client would.
+
+        client = TestClient(SearchAPI(SearchService.from_data()))
+        client.get('/search', q='2BHK in Pune').decoded()['results']
+    """
+
+    # Not a test case, despite the name
+    __test__ = False
+
+    def __init__(self, api):
+        self.api = api
+        self.loop = asyncio.new_event_loop()
+
+    def get(self, path, **params):
+        return self.request('GET', f"{path}?{urlencode(params)}" if params else path)
+
+    def post(self, path, data=None):
+        return self.request('POST', path, json.dumps(data or {}).encode())
+
+    def request(self, method, target, body=b''):
+        return self.loop.run_until_complete(self.api.respond(method, target, body))
+
+    def close(self):
+        self.loop.close()
+        self.api.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,106 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class ResultCache:
+    """Thread-safe LRU cache with an entry limit, a memory budget and an optional TTL"""
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024, ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Look up a key, refreshing its recency
+
+        Returns:
+            tuple: (hit, value) with value None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        """Store a value, evicting least recently used entries to stay in budget"""
+        if self.max_entries <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after the underlying data was reloaded"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _discard(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+def estimate_size(value):
+    """Approximate memory held by a cached value, in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.index.memory_usage(deep=True)) + sum(_column_size(column) for _, column in value.items())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def _column_size(column):
+    """
+    Bytes held by one column; a categorical slice shares its categories with
+    the whole catalogue, so only its codes and the categories it uses count
+    """
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return int(column.memory_usage(index=False, deep=True))
+    codes = column.array.codes
+    used = np.unique(codes[codes >= 0])
+    return codes.nbytes + int(column.cat.categories.take(used).memory_usage(deep=True))
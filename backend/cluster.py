@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import socket
+import threading
+
+from .api import SearchAPI
+from .logs import configure_logging
+from .metrics import Metrics
+from .service import SearchService
+from .shared import SharedCatalogue
+
+logger = logging.getLogger(__name__)
+
+# Workers fork from a small server process that has only imported the
+# backend, never from the parent: none inherits its loaded frames, and a
+# new worker skips interpreter start-up and imports entirely
+if 'forkserver' in multiprocessing.get_all_start_methods():
+    CONTEXT = multiprocessing.get_context('forkserver')
+    CONTEXT.set_forkserver_preload([__name__])
+else:
+    CONTEXT = multiprocessing.get_context('spawn')
+
+# Seconds between checks for workers that died
+SUPERVISE_INTERVAL = 1.0
+
+
+def run_worker(directory, sock, threads, max_pending, level, metrics_enabled):
+    """Entry point of one worker process: attach, then serve on the shared socket"""
+    configure_logging(level)
+    catalogue = SharedCatalogue.attach(directory)
+    service = SearchService.from_index(catalogue.index, metrics=Metrics(enabled=metrics_enabled))
+    api = SearchAPI(service, workers=threads, max_pending=max_pending)
+    try:
+        asyncio.run(api.serve(sock=sock))
+    except KeyboardInterrupt:
+        pass
+
+
+class ServerCluster:
+    """
+    Several API worker processes over one catalogue loaded once
+
+    The parent builds the index, publishes it as a SharedCatalogue and
+    binds the listening socket; each worker attaches the catalogue and
+    accepts connections on that socket, so the kernel spreads them over
+    the workers. Memory stays close to one catalogue however many workers
+    run, and a replacement worker is serving within moments of a crash.
+
+    Each worker keeps its own result cache and metrics, so /metrics
+    describes whichever worker answered.
+    """
+
+    def __init__(self, index, processes, host='127.0.0.1', port=8000, threads=1,
+                 max_pending=None, level=logging.INFO, metrics=True):
+        self.index = index
+        self.processes = processes
+        self.host = host
+        self.port = port
+        self.threads = threads
+        self.max_pending = max_pending
+        self.level = level
+        self.metrics = metrics
+        self.catalogue = None
+        self.sock = None
+        self.workers = []
+        self.stopping = threading.Event()
+        self.handles_sigterm = False
+
+    def start(self):
+        """Publish the catalogue, bind the socket and start every worker"""
+        self.catalogue = SharedCatalogue.publish(self.index)
+        # Nothing else in the parent needs the index once it is published
+        self.index = None
+        self.sock = socket.create_server((self.host, self.port))
+        self.port = self.sock.getsockname()[1]
+        for _ in range(self.processes):
+            self.add_worker()
+        logger.info("Serving on %s:%s with %d worker processes", self.host, self.port, self.processes)
+
+    def add_worker(self):
+        """Start one more worker process"""
+        process = CONTEXT.Process(
+            target=run_worker,
+            args=(self.catalogue.directory, self.sock, self.threads, self.max_pending, self.level, self.metrics),
+            daemon=True,
+        )
+        process.start()
+        self.workers.append(process)
+        return process
+
+    def supervise(self):
+        """Replace workers that exited, until interrupted or asked to stop"""
+        while not self.stopping.wait(SUPERVISE_INTERVAL):
+            for process in list(self.workers):
+                if not process.is_alive():
+                    logger.warning("Worker %s exited with %s, starting a new one", process.pid, process.exitcode)
+                    self.workers.remove(process)
+                    self.add_worker()
+
+    def stop(self):
+        """Stop every worker and remove the published catalogue"""
+        for process in self.workers:
+            process.terminate()
+        for process in self.workers:
+            process.join()
+        self.workers = []
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+        if self.catalogue is not None:
+            self.catalogue.close()
+        # Past this point a further SIGTERM just ends the process
+        if self.handles_sigterm:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.handles_sigterm = False
+
+    def serve_forever(self):
+        # A plain `kill` shuts down as cleanly as Ctrl-C
+        signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+        self.handles_sigterm = True
+        self.start()
+        try:
+            self.supervise()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
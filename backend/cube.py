@@ -0,0 +1,185 @@
+import numpy as np
+
+from .stats import PRICE_BAND_LABELS, plain
+
+# Dimensions of the cube, in axis order
+CUBE_DIMENSIONS = ['city', 'bhk', 'status', 'price_band']
+
+
+class FacetCube:
+    """
+    Pre-aggregated counts and prices keyed by city x BHK x status x price band
+
+    Each cell holds the row count, priced-row count, price sum, minimum and
+    maximum of the rows with that combination, so dashboard metrics are a
+    sum over a few hundred cells however large the catalogue is. Every axis
+    has a trailing slot for rows where the dimension is missing. A cube is
+    never modified; updated() returns a new one.
+    """
+
+    def __init__(self, values, count, priced, total, low, high):
+        # values: distinct values per dimension, indexing every axis but its last slot
+        self.values = values
+        self.count = count
+        self.priced = priced
+        self.total = total
+        self.low = low
+        self.high = high
+
+    @classmethod
+    def build(cls, codes, values, prices):
+        """
+        Aggregate every row into its cell
+
+        Args:
+            codes (dict): {dimension: code per row, -1 for missing}
+            values (dict): {dimension: distinct values the codes refer to}
+            prices (np.ndarray): price in crores per row
+        """
+        values = [list(values[name]) for name in CUBE_DIMENSIONS]
+        cube = cls.empty(values)
+        cube._add(codes, prices)
+        return cube
+
+    @classmethod
+    def empty(cls, values):
+        shape = tuple(len(v) + 1 for v in values)
+        return cls(
+            values,
+            np.zeros(shape, dtype=np.int64),
+            np.zeros(shape, dtype=np.int64),
+            np.zeros(shape, dtype=np.float64),
+            np.full(shape, np.inf),
+            np.full(shape, -np.inf),
+        )
+
+    def updated(self, removed, added, current, values):
+        """
+        Cube after rows were removed and added, leaving this one untouched
+
+        Counts and sums are adjusted by the changed rows alone. A cell whose
+        minimum or maximum row was removed is recomputed from the current
+        rows of that cell only.
+
+        Args:
+            removed (tuple): (codes, prices) of rows no longer in the catalogue
+            added (tuple): (codes, prices) of new rows
+            current (tuple): (codes, prices) of the whole updated catalogue
+            values (dict): distinct values per dimension, extending this cube's
+        """
+        # Vocabularies only grow, so old cells keep their coordinates
+        cube = self._regrown([list(values[name]) for name in CUBE_DIMENSIONS])
+
+        removed_cells = cube._cells(removed[0])
+        np.subtract.at(cube.count.ravel(), removed_cells, 1)
+        removed_prices = np.asarray(removed[1], dtype=np.float64)
+        priced = ~np.isnan(removed_prices)
+        removed_cells, removed_prices = removed_cells[priced], removed_prices[priced]
+        np.subtract.at(cube.priced.ravel(), removed_cells, 1)
+        np.subtract.at(cube.total.ravel(), removed_cells, removed_prices)
+        cube._add(*added)
+
+        # Cells that lost their cheapest or dearest row need a rescan
+        lost = (removed_prices <= cube.low.ravel()[removed_cells]) | (removed_prices >= cube.high.ravel()[removed_cells])
+        dirty = np.unique(removed_cells[lost])
+        if len(dirty):
+            prices = np.asarray(current[1], dtype=np.float64)
+            cells = cube._cells(current[0])
+            rows = np.isin(cells, dirty) & ~np.isnan(prices)
+            cube.low.ravel()[dirty] = np.inf
+            cube.high.ravel()[dirty] = -np.inf
+            np.minimum.at(cube.low.ravel(), cells[rows], prices[rows])
+            np.maximum.at(cube.high.ravel(), cells[rows], prices[rows])
+        return cube
+
+    def _regrown(self, values):
+        """Copy of this cube with axes widened to the given vocabularies"""
+        cube = FacetCube.empty(values)
+        # Old value slots keep their coordinates; each axis' missing slot moves to its new end
+        target = np.ix_(*[
+            np.append(np.arange(len(v)), len(values[axis]))
+            for axis, v in enumerate(self.values)
+        ])
+        for name in ('count', 'priced', 'total', 'low', 'high'):
+            getattr(cube, name)[target] = getattr(self, name)
+        return cube
+
+    def _cells(self, codes):
+        """Flat cell number per row"""
+        coordinates = []
+        for axis, name in enumerate(CUBE_DIMENSIONS):
+            axis_codes = np.asarray(codes[name], dtype=np.int64)
+            coordinates.append(np.where(axis_codes < 0, len(self.values[axis]), axis_codes))
+        return np.ravel_multi_index(coordinates, self.count.shape)
+
+    def _add(self, codes, prices):
+        prices = np.asarray(prices, dtype=np.float64)
+        cells = self._cells(codes)
+        size = self.count.size
+        self.count += np.bincount(cells, minlength=size).reshape(self.count.shape)
+        priced = ~np.isnan(prices)
+        cells, prices = cells[priced], prices[priced]
+        self.priced += np.bincount(cells, minlength=size).reshape(self.count.shape)
+        self.total += np.bincount(cells, weights=prices, minlength=size).reshape(self.count.shape)
+        np.minimum.at(self.low.ravel(), cells, prices)
+        np.maximum.at(self.high.ravel(), cells, prices)
+
+    def totals(self, **fixed):
+        """
+        Count and price aggregates over the cells matching every fixed dimension
+
+        A fixed value is either a dimension value or a predicate on it,
+        e.g. totals(city='Pune', status=lambda s: 'Ready' in s).
+
+        Returns:
+            dict: {'count', 'avg_price', 'min_price', 'max_price'}
+        """
+        return self._summarize(self._slice(fixed))
+
+    def breakdown(self, dimension, **fixed):
+        """
+        totals() per value of one dimension, e.g. per-city averages
+
+        Returns:
+            dict: {value: totals}, by descending count, rows missing the
+                  dimension under None
+        """
+        axis = CUBE_DIMENSIONS.index(dimension)
+        cells = self._slice(fixed)
+        groups = {}
+        for slot, value in enumerate(self.values[axis] + [None]):
+            part = tuple(np.take(array, [slot], axis=axis) for array in cells)
+            summary = self._summarize(part)
+            if summary['count']:
+                groups[value] = summary
+        return dict(sorted(groups.items(), key=lambda item: -item[1]['count']))
+
+    def _slice(self, fixed):
+        """Cell arrays restricted to the fixed dimensions"""
+        cells = (self.count, self.priced, self.total, self.low, self.high)
+        for name, wanted in fixed.items():
+            axis = CUBE_DIMENSIONS.index(name)
+            matches = wanted if callable(wanted) else (lambda value, wanted=wanted: value == wanted)
+            slots = [slot for slot, value in enumerate(self.values[axis]) if matches(value)]
+            cells = tuple(np.take(array, slots, axis=axis) for array in cells)
+        return cells
+
+    @staticmethod
+    def _summarize(cells):
+        count, priced, total, low, high = cells
+        rows, priced_rows = int(count.sum()), int(priced.sum())
+        if priced_rows == 0:
+            return {'count': rows, 'avg_price': 0, 'min_price': 0, 'max_price': 0}
+        return {
+            'count': rows,
+            'avg_price': float(total.sum() / priced_rows),
+            'min_price': float(low.min()),
+            'max_price': float(high.max()),
+        }
+
+
+def cube_values(indexes):
+    """Cube vocabularies from the value indexes of a SearchIndex"""
+    values = {name: [plain(v) for v in index.values] for name, index in indexes.items()}
+    values['price_band'] = PRICE_BAND_LABELS
+    return values
@@ -1,19 +1,401 @@
+import logging
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
 import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .details import DetailStore, DetailWriter
+from .query_parser import DEFAULT_LOCALITIES, WORD_PATTERN, LocalityMatcher
+from .schema import ADDRESSES, CONFIGURATIONS, PROJECTS, SOURCE_SCHEMAS, VARIANTS
+from .snapshot import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# City gazetteer in priority order: explicit city names win over area names
+CITY_PRIORITY = [
+    ('Mumbai', ['mumbai']),
+    ('Pune', ['pune']),
+    ('Delhi', ['delhi']),
+    ('Bangalore', ['bangalore', 'bengaluru']),
+    ('Pune', ['pimpri', 'chinchwad', 'wakad', 'baner', 'kharadi',
+              'hinjewadi', 'ravet', 'mundhwa', 'hadapsar', 'viman nagar',
+              'shivajinagar', 'camp', 'kothrud', 'aundh', 'mamurdi']),
+    ('Mumbai', ['chembur', 'andheri', 'bandra', 'goregaon', 'borivali',
+                'mulund', 'thane', 'powai', 'ghatkopar', 'kurla', 'dadar',
+                'worli', 'colaba', 'marine drive', 'lower parel']),
+]
+
+CITY_NAMES = list(dict.fromkeys(city for city, _ in CITY_PRIORITY))
+
+# Locality gazetteer shared with the query parser, in the spelling filters use
+LOCALITY_NAMES = list(dict.fromkeys(locality.title() for locality in DEFAULT_LOCALITIES))
+LOCALITY_MATCHER = LocalityMatcher(LOCALITY_NAMES)
+
+# Lowercased copies of the searchable text columns, matched by the search indexes
+SEARCH_KEY_COLUMNS = {
+    'fullAddress': 'address_key',
+    'landmark': 'landmark_key',
+    'projectName': 'project_key',
+}
+
+# One precompiled alternation per priority tier (plain substring matching)
+CITY_PATTERNS = [
+    (city, re.compile('|'.join(re.escape(term) for term in terms)))
+    for city, terms in CITY_PRIORITY
+]
+
+# Columns kept in the in-memory catalogue: what search, stats and cards read
+COMPACT_COLUMNS = [
+    'projectName', 'type', 'bhk', 'price_cr', 'status', 'city', 'fullAddress',
+    'landmark', 'furnishing', 'carpetArea', 'balcony', 'slug', 'projectCategory',
+    'id_variant', 'locality', 'address_key', 'landmark_key', 'project_key',
+]
+
+# Low-cardinality or heavily repeated text, stored once per distinct value
+CATEGORY_COLUMNS = [
+    'city', 'status', 'type', 'furnishing', 'projectCategory',
+    'projectName', 'fullAddress', 'landmark', 'slug', 'locality',
+    'address_key', 'landmark_key', 'project_key',
+]
+
+# Whole-number columns downcast to the smallest nullable integer type
+INTEGER_COLUMNS = ['bhk', 'balcony']
+
+# Heavy text and media fields, moved to the lazily read detail store
+DETAIL_COLUMNS = [
+    'propertyImages', 'floorPlanImage', 'aboutProperty', 'projectSummary',
+    'possessionDate', 'reraId', 'maintenanceCharges', 'createdAt', 'updatedAt',
+]
+
+# Source columns _derive_columns reads; only these are shipped to cleaning workers
+CLEAN_INPUT_COLUMNS = ['price', 'type', 'bathrooms', 'status', 'fullAddress', 'landmark', 'carpetArea', 'furnishedType', 'projectName']
+
+# Below this many merged rows, process start-up costs more than cleaning
+PARALLEL_MIN_ROWS = 100000
+
+# Optional flag column in a delta CSV marking variants to remove
+DELETED_COLUMN = 'deleted'
+
+# Source row positions that put streamed chunks back in single-merge order
+ORDER_KEYS = ['_config_pos', '_variant_pos', '_project_pos', '_address_pos']
+
+SOURCE_FILES = [schema.file_name for schema in SOURCE_SCHEMAS]
 
 class DataLoader:
-    def __init__(self, data_dir='data'):
+    def __init__(self, data_dir='data', snapshot_dir=None, use_snapshot=True, compact=True, chunksize=None, workers=None, engine=None):
         self.data_dir = data_dir
+        # CSV parser engine, schema.PARSER_ENGINE by default
+        self.engine = engine
+        self.chunksize = chunksize
+        # Opt-in parallelism: CSVs are read on threads, cleaning runs on processes
+        self.workers = workers
         self.df = None
+        self.details = None
+        # Latest variant updatedAt folded into the catalogue, for refresh()
+        self.watermark = None
+        # Rows the schema rejected during the last load or refresh, per file
+        self.rejected = {}
+        self.use_snapshot = use_snapshot
+        self.compact = compact
+        self.snapshot = SnapshotStore(snapshot_dir or os.path.join(data_dir, '.snapshot'))
+    
+    def source_paths(self):
+        """Paths of the CSV files the merged frame is built from"""
+        return [os.path.join(self.data_dir, name) for name in SOURCE_FILES]
         
     def load_and_merge(self):
         """Load all CSV files and merge them into a single dataframe"""
+        if self.chunksize:
+            return self.load_streaming(self.chunksize)
+        
+        # Fingerprint before parsing so a file rewritten mid-load is not cached
+        fingerprint = self.snapshot.fingerprint(self.source_paths()) if self.use_snapshot else None
         
         # Load individual CSVs
-        projects = pd.read_csv(os.path.join(self.data_dir, 'project.csv'))
-        configs = pd.read_csv(os.path.join(self.data_dir, 'ProjectConfiguration.csv'))
-        variants = pd.read_csv(os.path.join(self.data_dir, 'ProjectConfigurationVariant.csv'))
-        addresses = pd.read_csv(os.path.join(self.data_dir, 'ProjectAddress.csv'))
+        self.rejected = {}
+        projects, configs, variants, addresses = self._read_tables()
+        full_data = self._merge(projects, configs, variants, addresses)
+        del variants
+        
+        # Clean and transform data
+        full_data = self._clean_data(full_data)
+        self.watermark = self._latest_update(full_data)
+        
+        details = None
+        if self.compact:
+            full_data, details = self._compact(full_data)
+        
+        self.df = full_data
+        self.details = DetailStore(frame=details) if details is not None else None
+        if self.use_snapshot:
+            self._save_snapshot(fingerprint, details)
+        return self.df
+    
+    def load_streaming(self, chunksize=100000):
+        """
+        Build the compact catalogue reading the variant file in chunks
+        
+        The project, address and configuration tables are small and stay in
+        memory; each variant chunk is joined against them, cleaned and
+        compacted on its own. Detail fields are appended to the on-disk
+        detail store as chunks arrive, so peak memory is one raw chunk plus
+        the compact catalogue. The result is identical to load_and_merge.
+        
+        Args:
+            chunksize (int): Variant rows parsed per chunk
+            
+        Returns:
+            pd.DataFrame: the compact catalogue
+        """
+        if not self.compact:
+            raise ValueError("Streaming ingestion builds the compact layout, use compact=True")
+        
+        fingerprint = self.snapshot.fingerprint(self.source_paths()) if self.use_snapshot else None
+        
+        self.rejected = {}
+        projects, configs, addresses = self._read_dimensions()
+        # Remember source positions so the chunks can be ordered like one big merge
+        for table, column in ((configs, '_config_pos'), (projects, '_project_pos'), (addresses, '_address_pos')):
+            table[column] = np.arange(len(table), dtype=np.int64)
+        
+        writer = scratch = None
+        watermark = None
+        keys, parts, kept = [], [], []
+        variant_rows = merged_rows = 0
+        for chunk, rejected in VARIANTS.read_chunks(self._path(VARIANTS), chunksize):
+            self._record_rejected(VARIANTS, rejected)
+            chunk['_variant_pos'] = np.arange(variant_rows, variant_rows + len(chunk), dtype=np.int64)
+            variant_rows += len(chunk)
+            
+            merged = self._merge(projects, configs, chunk, addresses)
+            merged['_row'] = np.arange(merged_rows, merged_rows + len(merged), dtype=np.int64)
+            merged_rows += len(merged)
+            # Unmatched addresses (left join) have no position; there is one such row per key
+            keys.append(merged[ORDER_KEYS].fillna(-1).to_numpy(dtype=np.int64))
+            
+            cleaned = self._clean_data(merged)
+            watermark = self._later(watermark, self._latest_update(cleaned))
+            rows = cleaned['_row'].to_numpy()
+            part, details = self._split_details(cleaned)
+            part.index = rows
+            parts.append(self._categorize(part))
+            kept.append(rows)
+            
+            if writer is None:
+                # Removed with the store, unless a snapshot adopts the files first
+                scratch = tempfile.TemporaryDirectory(prefix='property-details-', ignore_cleanup_errors=True)
+                writer = DetailWriter(scratch.name, details.columns)
+            writer.append(details)
+        
+        # Label every row with its position in the single-merge order, as the
+        # in-memory path does before dropping incomplete rows
+        keys = np.concatenate(keys)
+        ranks = np.empty(len(keys), dtype=np.int64)
+        ranks[np.lexsort(keys.T[::-1])] = np.arange(len(keys), dtype=np.int64)
+        
+        catalogue = self._concat_parts(parts)
+        catalogue.index = ranks[catalogue.index.to_numpy()]
+        catalogue = self._downcast(catalogue.sort_index())
+        
+        self.df = catalogue
+        self.details = writer.close(ranks[np.concatenate(kept)])
+        self.details.scratch = scratch
+        self.watermark = watermark
+        logger.info("Streamed %d variant rows into %d catalogue rows", variant_rows, len(catalogue))
+        if self.use_snapshot:
+            self._save_snapshot(fingerprint, self.details)
+        return self.df
+    
+    def refresh(self, delta_path=None):
+        """
+        Fold variant changes into the loaded catalogue without a full rebuild
+        
+        Without a delta file, ProjectConfigurationVariant.csv is scanned for
+        rows updated after the watermark (or not in the catalogue yet), and
+        catalogue rows whose variant is gone from the file are removed. A
+        delta CSV has the variant columns plus an optional `deleted` flag.
+        Changed rows get new labels; the frame and detail store are built on
+        the side and swapped in at the end. Project, configuration and
+        address edits still need a full load_and_merge.
+        
+        Args:
+            delta_path (str): Optional CSV of changed variant rows
+            
+        Returns:
+            dict: {'upserted': labels of new rows, 'removed': labels dropped},
+                  ready to pass to SearchEngine.refresh
+        """
+        if self.df is None:
+            self.get_data()
+        
+        self.rejected = {}
+        if delta_path is None:
+            changed, removed_ids = self._changed_variants()
+        else:
+            changed, removed_ids = self._read_delta(delta_path)
+        
+        # An updated variant replaces its old rows
+        replaced = self.df['id_variant'].isin(set(changed['id']) | set(removed_ids)).to_numpy()
+        removed = self.df.index[replaced].to_numpy()
+        
+        df = self.df[~replaced]
+        upserted = np.empty(0, dtype=np.int64)
+        watermark = self.watermark
+        if len(changed):
+            projects, configs, addresses = self._read_dimensions()
+            cleaned = self._clean_data(self._merge(projects, configs, changed, addresses))
+            next_label = int(self.df.index.max()) + 1 if len(self.df) else 0
+            cleaned.index = pd.RangeIndex(next_label, next_label + len(cleaned))
+            upserted = cleaned.index.to_numpy()
+            watermark = self._later(watermark, self._latest_update(cleaned))
+            
+            if self.compact:
+                part, details = self._split_details(cleaned)
+                df = self._downcast(self._concat_parts([df, self._downcast(self._categorize(part))]))
+                self.details = self.details.updated(details, removed)
+            else:
+                df = self._concat_parts([df, cleaned])
+        elif self.compact and len(removed):
+            # Nothing added, but the removed rows' details must stop resolving
+            self.details = self.details.updated(pd.DataFrame(index=pd.Index([], dtype=np.int64)), removed)
+        # Drop categories only the replaced rows used, as a full load would
+        for column in df.select_dtypes('category').columns:
+            df[column] = df[column].cat.remove_unused_categories()
+        
+        self.df = df
+        self.watermark = watermark
+        logger.info("Refreshed: %d rows upserted, %d removed", len(upserted), len(removed))
+        return {'upserted': upserted, 'removed': removed}
+    
+    def _changed_variants(self):
+        """
+        Variant rows newer than the watermark, and ids missing from the file
+        
+        Returns:
+            tuple: (changed variant rows, removed variant ids)
+        """
+        path = self._path(VARIANTS)
+        stamps = pd.read_csv(path, usecols=['id', 'updatedAt'], dtype='str')
+        known = self.df['id_variant']
+        
+        fresh = ~stamps['id'].isin(known)
+        if self.watermark is None:
+            fresh[:] = True
+        else:
+            fresh |= self._update_times(stamps['updatedAt']) > self.watermark
+        wanted = set(stamps.loc[fresh, 'id'])
+        removed_ids = known[~known.isin(stamps['id'])].tolist()
+        
+        # Only the changed rows are kept while the file is scanned
+        changed = []
+        for chunk, rejected in VARIANTS.read_chunks(path, self.chunksize or 100000, subset=self.compact):
+            changed.append(chunk[chunk['id'].isin(wanted)])
+            # A changed row that no longer validates takes its old version with it
+            rejected = rejected[rejected['id'].isin(wanted)]
+            self._record_rejected(VARIANTS, rejected)
+            removed_ids += rejected['id'].tolist()
+        return pd.concat(changed), removed_ids
+    
+    def _read_delta(self, path):
+        """
+        Split a delta CSV into upserts and deletions
+        
+        Returns:
+            tuple: (changed variant rows, removed variant ids)
+        """
+        # Every column is kept so the deleted flag survives
+        valid, rejected = VARIANTS.read(path, subset=False, engine=self.engine)
+        deleted = lambda frame: (
+            frame[DELETED_COLUMN].astype(str).str.strip().str.lower().isin(['true', '1', 'yes'])
+            if DELETED_COLUMN in frame.columns else pd.Series(False, index=frame.index)
+        )
+        # Deletion rows need nothing but an id, so they are not reported
+        self._record_rejected(VARIANTS, rejected[~deleted(rejected)])
+        removed_ids = valid.loc[deleted(valid), 'id'].tolist() + rejected['id'].dropna().tolist()
+        changed = valid[~deleted(valid)].drop(columns=DELETED_COLUMN, errors='ignore')
+        return changed.drop_duplicates('id', keep='last'), removed_ids
+    
+    @staticmethod
+    def _latest_update(df):
+        """Most recent variant updatedAt in a frame, None if there is none"""
+        if 'updatedAt' not in df.columns:
+            return None
+        latest = DataLoader._update_times(df['updatedAt']).max()
+        return None if pd.isna(latest) else latest
+    
+    @staticmethod
+    def _update_times(values):
+        """
+        Parse updatedAt values as naive UTC timestamps
+        
+        Each value is read as ISO 8601 on its own, so '2030-01-01 00:00:00',
+        '2030-01-01T00:00:00Z' and millisecond precision can be mixed;
+        values with an offset are converted to UTC. Unparseable values
+        become NaT and are logged, since such rows never count as changed.
+        """
+        times = pd.to_datetime(values, errors='coerce', format='ISO8601', utc=True).dt.tz_localize(None)
+        invalid = times.isna() & values.notna()
+        if invalid.any():
+            logger.warning("Ignoring %d unparseable updatedAt values, e.g. %r",
+                           int(invalid.sum()), values[invalid].iloc[0])
+        return times
+    
+    @staticmethod
+    def _later(first, second):
+        if first is None or second is None:
+            return second if first is None else first
+        return max(first, second)
+    
+    def _read_tables(self):
+        """
+        Read all four source tables, concurrently when workers is set
+        
+        Returns:
+            tuple: (projects, configs, variants, addresses)
+        """
+        schemas = [PROJECTS, CONFIGURATIONS, VARIANTS, ADDRESSES]
+        if not self.workers:
+            return tuple(self._read(schema) for schema in schemas)
+        
+        # The C parser releases the GIL while tokenizing, so threads overlap
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(schemas))) as pool:
+            futures = [pool.submit(self._read, schema) for schema in schemas]
+            return tuple(future.result() for future in futures)
+    
+    def _read_dimensions(self):
+        """
+        Read the small dimension tables
+        
+        Returns:
+            tuple: (projects, configs, addresses)
+        """
+        return self._read(PROJECTS), self._read(CONFIGURATIONS), self._read(ADDRESSES)
+    
+    def _read(self, schema):
+        """Parse one source table with its schema, keeping the rejected rows"""
+        # The compact catalogue only needs the schema's `used` columns
+        valid, rejected = schema.read(self._path(schema), subset=self.compact, engine=self.engine)
+        self._record_rejected(schema, rejected)
+        return valid
+    
+    def _record_rejected(self, schema, rejected):
+        if len(rejected) == 0:
+            return
+        previous = self.rejected.get(schema.file_name)
+        self.rejected[schema.file_name] = rejected if previous is None else pd.concat([previous, rejected])
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("Rejected %d rows from %s: %s",
+                           len(rejected), schema.file_name, rejected['reason'].value_counts().to_dict())
+    
+    def _path(self, schema):
+        return os.path.join(self.data_dir, schema.file_name)
+    
+    @staticmethod
+    def _merge(projects, configs, variants, addresses):
+        """Join variants to their configuration, project and address"""
         
         # Merge configs with variants
         config_variants = pd.merge(
@@ -36,7 +418,7 @@ class DataLoader:
         )
         
         # Merge with addresses
-        full_data = pd.merge(
+        return pd.merge(
             full_data,
             addresses,
             left_on='projectId',
@@ -44,94 +426,299 @@ class DataLoader:
             how='left',
             suffixes=('', '_address')
         )
+    
+    @property
+    def layout(self):
+        """Which frame layout a snapshot holds"""
+        return 'compact' if self.compact else 'full'
+    
+    def _save_snapshot(self, fingerprint, details=None):
+        """Persist the cleaned frame; a failed write only costs the next cold start"""
+        try:
+            meta = {'watermark': self.watermark.isoformat() if self.watermark is not None else None}
+            self.snapshot.save(self.df, fingerprint, layout=self.layout, details=details, meta=meta)
+        except OSError as e:
+            logger.warning("Could not write snapshot: %s", e)
+            return
+        # Serve detail fields from disk from now on instead of holding them
+        if details is not None:
+            self.details = self.snapshot.details() or self.details
+    
+    def _compact(self, df):
+        """
+        Shrink the cleaned frame to what search and cards need
         
-        # Clean and transform data
-        full_data = self._clean_data(full_data)
+        Returns:
+            tuple: (compact catalogue, heavy detail columns with the same index)
+        """
+        df, details = self._split_details(df)
+        return self._downcast(self._categorize(df)), details
+    
+    @staticmethod
+    def _split_details(df):
+        """Separate the catalogue columns from the heavy detail columns"""
+        details = df[[c for c in DETAIL_COLUMNS if c in df.columns]]
+        return df[[c for c in COMPACT_COLUMNS if c in df.columns]].copy(), details
+    
+    @staticmethod
+    def _categorize(df):
+        """Store repeated text as categoricals with sorted categories"""
+        for column in CATEGORY_COLUMNS:
+            if column in df.columns:
+                values = df[column].astype('category').cat.remove_unused_categories()
+                # Sorted so categories unioned across chunks come out the same
+                df[column] = values.cat.reorder_categories(sorted(values.cat.categories))
+        return df
+    
+    def _downcast(self, df):
+        """Downcast whole-number columns over the complete catalogue"""
+        for column in INTEGER_COLUMNS:
+            if column in df.columns:
+                df[column] = self._downcast_integers(df[column])
         
-        self.df = full_data
-        return self.df
+        # price_cr and carpetArea stay float64: float32 would shift prices
+        # across budget boundaries and print carpet areas like 188.72999
+        return df
+    
+    @staticmethod
+    def _concat_parts(parts):
+        """Concatenate compacted chunks, unioning their categories"""
+        catalogue = pd.concat(parts)
+        for column in parts[0].select_dtypes('category').columns:
+            values = [part[column].array for part in parts]
+            catalogue[column] = DataLoader._union_categoricals(values, sort_categories=True)
+        return catalogue
+    
+    @staticmethod
+    def _union_categoricals(values, sort_categories=False):
+        """union_categoricals that tolerates parts holding only missing values"""
+        # Such parts have untyped empty categories, which cannot be unioned as is
+        typed = next((v.categories[:0] for v in values if len(v.categories)), None)
+        if typed is not None:
+            values = [v if len(v.categories) else v.set_categories(typed) for v in values]
+        return union_categoricals(values, sort_categories=sort_categories)
+    
+    @staticmethod
+    def _downcast_integers(series):
+        """Smallest nullable integer dtype that holds every value, if all are whole"""
+        values = series.dropna()
+        if len(values) and not (values == values.round()).all():
+            return series
+        smallest = pd.to_numeric(values, downcast='integer').dtype if len(values) else np.dtype(np.int8)
+        return series.astype(f"Int{smallest.itemsize * 8}")
+    
+    def close(self):
+        """Remove temporary detail files of the loaded catalogue"""
+        if self.details is not None:
+            self.details.close()
+    
+    def get_details(self, labels):
+        """
+        Heavy text and media fields for a few rows, e.g. when a card is rendered
+        
+        Args:
+            labels (list): Row labels from the catalogue index
+            
+        Returns:
+            pd.DataFrame: DETAIL_COLUMNS for those rows
+        """
+        if self.details is not None:
+            return self.details.get(labels)
+        return self.df.loc[list(labels), [c for c in DETAIL_COLUMNS if c in self.df.columns]]
+    
+    def load_snapshot(self):
+        """
+        Load the merged frame from the snapshot if it matches the source files
+        
+        Returns:
+            pd.DataFrame or None if the snapshot is missing or stale
+        """
+        if not self.snapshot.is_fresh(self.source_paths(), layout=self.layout):
+            return None
+        df = self.snapshot.load()
+        if df is not None:
+            self.details = self.snapshot.details() if self.compact else None
+            watermark = self.snapshot.metadata().get('watermark')
+            self.watermark = pd.Timestamp(watermark) if watermark else None
+            logger.info("Loaded %d rows from snapshot", len(df))
+        return df
     
     def _clean_data(self, df):
         """Clean and standardize the data"""
         
-        print(f"[DataLoader] Cleaning {len(df)} rows...")
+        logger.info("Cleaning %d rows...", len(df))
         
-        # Convert price to numeric (handle millions)
-        df['price'] = pd.to_numeric(df['price'], errors='coerce')
-        df['price_cr'] = df['price'] / 10000000  # Convert to Crores
+        if self.workers and self.workers > 1 and len(df) >= PARALLEL_MIN_ROWS:
+            derived = self._derive_parallel(df)
+        else:
+            derived = self._derive_columns(df)
+        for column, values in derived.items():
+            df[column] = values
+        
+        # Drop rows with critical missing data
+        df = df.dropna(subset=['price', 'projectName'])
+        
+        logger.info("After cleaning: %d rows", len(df))
+        # Diagnostic value_counts passes over every row, skipped unless debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cities found: %s", df['city'].value_counts().to_dict())
+            logger.debug("Properties without city: %d", df['city'].isna().sum())
+            logger.debug("BHK distribution: %s", df['bhk'].value_counts().head().to_dict())
+        
+        return df
+    
+    @staticmethod
+    def _derive_columns(df):
+        """
+        Cleaned and derived columns, computed row by row from CLEAN_INPUT_COLUMNS
+        
+        Returns:
+            dict: {column: values}, in the order they are added to the frame
+        """
+        derived = {}
+        
+        # Price in rupees (handle millions); the schema already parsed it as a number
+        price = DataLoader._numeric(df['price'])
+        derived['price'] = price
+        derived['price_cr'] = price / 10000000  # Convert to Crores
         
         # Extract BHK from type field
-        df['bhk'] = df['type'].str.extract(r'(\d+)')[0]
-        df['bhk'] = pd.to_numeric(df['bhk'], errors='coerce')
+        bhk = pd.to_numeric(df['type'].str.extract(r'(\d+)')[0], errors='coerce')
         
         # Handle bathrooms as BHK proxy if bhk is missing
-        df['bathrooms'] = pd.to_numeric(df['bathrooms'], errors='coerce')
-        df['bhk'] = df['bhk'].fillna(df['bathrooms'])
+        bathrooms = DataLoader._numeric(df['bathrooms'])
+        derived['bhk'] = bhk.fillna(bathrooms)
+        derived['bathrooms'] = bathrooms
         
         # Standardize status
-        df['status'] = df['status'].str.replace('_', ' ').str.title()
-        
-        # Extract city from fullAddress - IMPROVED LOGIC
-        def extract_city(address):
-            if pd.isna(address):
-                return None
-            address_lower = str(address).lower()
-            
-            # Check for city names (order matters - check specific first)
-            if 'mumbai' in address_lower:
-                return 'Mumbai'
-            elif 'pune' in address_lower:
-                return 'Pune'
-            elif 'delhi' in address_lower:
-                return 'Delhi'
-            elif 'bangalore' in address_lower or 'bengaluru' in address_lower:
-                return 'Bangalore'
-            
-            # If no city found, check common Pune areas
-            pune_areas = ['pimpri', 'chinchwad', 'wakad', 'baner', 'kharadi', 
-                         'hinjewadi', 'ravet', 'mundhwa', 'hadapsar', 'viman nagar',
-                         'shivajinagar', 'camp', 'kothrud', 'aundh', 'mamurdi']
-            if any(area in address_lower for area in pune_areas):
-                return 'Pune'
-            
-            # Check common Mumbai areas
-            mumbai_areas = ['chembur', 'andheri', 'bandra', 'goregaon', 'borivali',
-                          'mulund', 'thane', 'powai', 'ghatkopar', 'kurla', 'dadar',
-                          'worli', 'colaba', 'marine drive', 'lower parel']
-            if any(area in address_lower for area in mumbai_areas):
-                return 'Mumbai'
-            
-            return None
-        
-        df['city'] = df['fullAddress'].apply(extract_city)
+        derived['status'] = df['status'].str.replace('_', ' ').str.title()
         
-        # For rows still without city, try to extract from other columns
-        if 'landmark' in df.columns:
-            mask = df['city'].isna()
-            df.loc[mask, 'city'] = df.loc[mask, 'landmark'].apply(extract_city)
+        # Extract city from fullAddress, falling back to landmark
+        derived['city'] = DataLoader._extract_city(df['fullAddress'], df.get('landmark'))
         
         # Carpet area
-        df['carpetArea'] = pd.to_numeric(df['carpetArea'], errors='coerce')
+        derived['carpetArea'] = DataLoader._numeric(df['carpetArea'])
         
         # Furnishing type
-        df['furnishing'] = df['furnishedType'].fillna('Unfurnished')
+        derived['furnishing'] = df['furnishedType'].fillna('Unfurnished')
         
         # Fill missing fullAddress with empty string for searching
-        df['fullAddress'] = df['fullAddress'].fillna('')
-        df['landmark'] = df['landmark'].fillna('')
+        derived['fullAddress'] = df['fullAddress'].fillna('')
+        derived['landmark'] = df['landmark'].fillna('')
         
-        # Drop rows with critical missing data
-        df = df.dropna(subset=['price', 'projectName'])
+        # Gazetteer locality from the address, falling back to landmark
+        derived['locality'] = DataLoader._extract_locality(derived['fullAddress'], derived['landmark'])
+        
+        # Lowercased search keys, so queries never lowercase catalogue text
+        for column, key in SEARCH_KEY_COLUMNS.items():
+            derived[key] = DataLoader._search_key(derived[column] if column in derived else df[column])
+        return derived
+    
+    @staticmethod
+    def _numeric(series):
+        """Numbers as parsed by the schema; other inputs are coerced once"""
+        if pd.api.types.is_numeric_dtype(series):
+            return series
+        return pd.to_numeric(series, errors='coerce')
+    
+    def _derive_parallel(self, df):
+        """
+        _derive_columns over row partitions on a process pool
         
-        print(f"[DataLoader] After cleaning: {len(df)} rows")
-        print(f"[DataLoader] Cities found: {df['city'].value_counts().to_dict()}")
-        print(f"[DataLoader] Properties without city: {df['city'].isna().sum()}")
-        print(f"[DataLoader] BHK distribution: {df['bhk'].value_counts().head().to_dict()}")
+        Only the input columns are sent to the workers, not the heavy text.
+        """
+        inputs = df[[c for c in CLEAN_INPUT_COLUMNS if c in df.columns]]
+        bounds = np.linspace(0, len(inputs), self.workers + 1).astype(int)
+        partitions = [inputs.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(DataLoader._derive_columns, partitions))
         
-        return df
+        derived = {}
+        for column in results[0]:
+            parts = [result[column] for result in results]
+            if column in ('city', 'locality'):
+                # Partitions see different places; keep the gazetteer order
+                names = CITY_NAMES if column == 'city' else LOCALITY_NAMES
+                places = self._union_categoricals(parts)
+                present = [name for name in names if name in places.categories]
+                derived[column] = places.reorder_categories(present)
+            elif column in SEARCH_KEY_COLUMNS.values():
+                derived[column] = self._union_categoricals(parts)
+            else:
+                derived[column] = pd.concat(parts)
+        return derived
+    
+    @staticmethod
+    def _match_city(text):
+        """
+        Vectorized gazetteer lookup over a text column
+        
+        Addresses repeat across every variant of a project, so the column is
+        factorized first and the tier patterns only run over distinct values.
+        
+        Returns:
+            np.ndarray: index into CITY_NAMES per row, -1 where nothing matched
+        """
+        codes, uniques = pd.factorize(text)
+        lowered = pd.Series(uniques, dtype=object).astype(str).str.lower()
+        conditions = [
+            lowered.str.contains(pattern, na=False).to_numpy(dtype=bool)
+            for _, pattern in CITY_PATTERNS
+        ]
+        choices = [CITY_NAMES.index(city) for city, _ in CITY_PATTERNS]
+        # np.select picks the first tier that matched, preserving priority
+        matched = np.select(conditions, choices, default=-1).astype(np.int8)
+        # Missing values factorize to -1, which lands on the trailing -1
+        return np.append(matched, np.int8(-1))[codes]
+    
+    @staticmethod
+    def _extract_city(address, landmark=None):
+        """Resolve the city from the address, then from the landmark for misses"""
+        codes = DataLoader._match_city(address)
+        if landmark is not None:
+            missing = codes < 0
+            if missing.any():
+                codes[missing] = DataLoader._match_city(landmark[missing])
+        cities = pd.Categorical.from_codes(codes, categories=CITY_NAMES)
+        return cities.remove_unused_categories()
+    
+    @staticmethod
+    def _match_locality(text):
+        """
+        Leftmost-longest whole-word gazetteer locality per row
+        
+        Returns:
+            np.ndarray: index into LOCALITY_NAMES per row, -1 where nothing matched
+        """
+        codes, uniques = pd.factorize(text)
+        positions = {name: i for i, name in enumerate(LOCALITY_NAMES)}
+        matched = [
+            positions.get(LOCALITY_MATCHER.find(WORD_PATTERN.findall(str(value).lower())), -1)
+            for value in uniques
+        ]
+        return np.array(matched + [-1], dtype=np.int16)[codes]
+    
+    @staticmethod
+    def _extract_locality(address, landmark):
+        """Resolve the locality from the address, then from the landmark for misses"""
+        codes = DataLoader._match_locality(address)
+        missing = codes < 0
+        if missing.any():
+            codes[missing] = DataLoader._match_locality(landmark[missing])
+        localities = pd.Categorical.from_codes(codes, categories=LOCALITY_NAMES)
+        return localities.remove_unused_categories()
+    
+    @staticmethod
+    def _search_key(text):
+        """Lowercased text as a categorical, lowercasing each distinct value once"""
+        codes, uniques = pd.factorize(text)
+        keys, lowered = pd.factorize(pd.Series(uniques, dtype=object).astype(str).str.lower())
+        return pd.Categorical.from_codes(np.append(keys, -1)[codes], categories=lowered)
     
     def get_data(self):
-        """Return the merged dataframe"""
+        """Return the merged dataframe, preferring a fresh snapshot over the CSVs"""
+        if self.df is None and self.use_snapshot:
+            self.df = self.load_snapshot()
         if self.df is None:
             self.load_and_merge()
-        return self.df
\ No newline at end of file
+        return self.df
@@ -0,0 +1,203 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class DetailStore:
+    """
+    Side store for heavy per-variant text and media fields
+
+    Fields such as propertyImages or aboutProperty are only needed when a
+    single card is rendered, so they are kept out of the search frame. On
+    disk every column is a UTF-8 blob with byte offsets, memory-mapped and
+    decoded one row at a time. Without a directory the fields simply stay
+    in memory. A store written to a scratch directory (a
+    tempfile.TemporaryDirectory) removes it on close(), or once no store
+    built from it is left.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, frame=None, directory=None, scratch=None):
+        self.frame = frame
+        self.directory = directory
+        self.scratch = scratch
+        # Rows added after the store was written, served ahead of the files
+        self.overlay = None
+        # Labels removed since, whose rows are still in the files
+        self.removed = frozenset()
+        self._columns = None
+        self._slots = None
+
+    @classmethod
+    def write(cls, directory, frame):
+        """Lay out the detail columns under directory and return a reader"""
+        writer = DetailWriter(directory, frame.columns)
+        writer.append(frame)
+        return writer.close(frame.index)
+
+    @classmethod
+    def open(cls, directory):
+        """Lazy reader over a written store, None if it does not exist"""
+        if not os.path.exists(os.path.join(directory, cls.MANIFEST)):
+            return None
+        return cls(directory=directory)
+
+    def updated(self, frame, removed=()):
+        """
+        Store with rows added or replaced, leaving this one untouched
+
+        The files on disk are immutable, so new rows live in a small
+        in-memory overlay until the next full rebuild, and removed labels
+        are remembered so their rows on disk no longer resolve.
+
+        Args:
+            frame (pd.DataFrame): detail columns of the new rows
+            removed (array-like): labels that no longer exist
+        """
+        if self.frame is not None:
+            return DetailStore(frame=pd.concat([self.frame.drop(index=removed, errors='ignore'), frame]))
+
+        self._map()
+        store = DetailStore(directory=self.directory, scratch=self.scratch)
+        store._columns, store._slots = self._columns, self._slots
+        added = frame.reindex(columns=list(self._columns))
+        if self.overlay is not None:
+            added = pd.concat([self.overlay.drop(index=removed, errors='ignore'), added])
+        store.overlay = added
+        store.removed = (self.removed | set(np.asarray(removed).tolist())) - set(added.index.tolist())
+        return store
+
+    def get(self, labels):
+        """
+        Detail fields for the given row labels
+
+        Returns:
+            pd.DataFrame: one row per label, None for missing values
+        """
+        labels = list(labels)
+        if self.frame is not None:
+            return self.frame.loc[labels]
+
+        if self.overlay is not None:
+            added = self.overlay.index.isin(labels)
+            if added.any():
+                stored = [label for label in labels if label not in self.overlay.index]
+                rows = pd.concat([self.overlay[added], self._read(stored)])
+                return rows.loc[labels]
+        return self._read(labels)
+
+    def close(self):
+        """Remove the scratch directory, if any; the store is unusable afterwards"""
+        if self.scratch is not None:
+            self.scratch.cleanup()
+            self.scratch = None
+
+    def _read(self, labels):
+        """Detail fields from the files on disk"""
+        if self.removed and not self.removed.isdisjoint(labels):
+            raise KeyError(f"Removed row labels: {sorted(self.removed.intersection(labels))}")
+        self._map()
+        sorted_labels, label_slots = self._slots
+        found = np.searchsorted(sorted_labels, labels)
+        if len(labels) and (found.max() >= len(sorted_labels) or (sorted_labels[found] != labels).any()):
+            raise KeyError(f"Unknown row labels: {labels}")
+        slots = label_slots[found].tolist()
+        data = {}
+        for name, (blob, offsets, missing) in self._columns.items():
+            data[name] = [
+                None if missing[slot] else blob[offsets[slot]:offsets[slot + 1]].tobytes().decode('utf-8')
+                for slot in slots
+            ]
+        return pd.DataFrame(data, index=pd.Index(labels))
+
+    def _map(self):
+        """Memory-map the columns on first use"""
+        if self._columns is not None:
+            return
+        with open(os.path.join(self.directory, self.MANIFEST)) as f:
+            manifest = json.load(f)
+
+        load = lambda name: np.load(os.path.join(self.directory, name), mmap_mode='r')
+        self._slots = (load('labels.npy'), load('slots.npy'))
+        self._columns = {
+            spec['name']: (
+                self._map_raw(f"{spec['stem']}.blob", np.uint8),
+                self._map_raw(f"{spec['stem']}.offsets", np.int64),
+                self._map_raw(f"{spec['stem']}.missing", np.bool_),
+            )
+            for spec in manifest['columns']
+        }
+
+    def _map_raw(self, name, dtype):
+        path = os.path.join(self.directory, name)
+        # np.memmap refuses empty files, which an all-missing column produces
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+
+
+class DetailWriter:
+    """
+    Build a DetailStore one chunk of rows at a time
+
+    Blobs, offsets and missing masks are appended to raw files as chunks
+    arrive, so nothing but the current chunk is held in memory. Row labels
+    are only needed at the end, which lets a streaming loader assign them
+    once every chunk has been seen.
+    """
+
+    def __init__(self, directory, columns):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = list(columns)
+        self._sizes = [0] * len(self.columns)
+        self._rows = 0
+        for position in range(len(self.columns)):
+            with open(self._path(position, 'blob'), 'wb'):
+                pass
+            with open(self._path(position, 'missing'), 'wb'):
+                pass
+            with open(self._path(position, 'offsets'), 'wb') as f:
+                f.write(np.zeros(1, dtype=np.int64).tobytes())
+
+    def append(self, frame):
+        """Append the rows of frame, in order, to every column"""
+        for position, name in enumerate(self.columns):
+            series = frame[name]
+            missing = series.isna().to_numpy()
+            encoded = [b'' if gone else str(value).encode('utf-8')
+                       for value, gone in zip(series.tolist(), missing)]
+            ends = np.cumsum([len(b) for b in encoded], dtype=np.int64) + self._sizes[position]
+            if len(ends):
+                self._sizes[position] = int(ends[-1])
+
+            with open(self._path(position, 'blob'), 'ab') as f:
+                f.write(b''.join(encoded))
+            with open(self._path(position, 'offsets'), 'ab') as f:
+                f.write(ends.tobytes())
+            with open(self._path(position, 'missing'), 'ab') as f:
+                f.write(missing.tobytes())
+        self._rows += len(frame)
+
+    def close(self, labels):
+        """
+        Attach row labels (one per appended row, in append order) and return a reader
+        """
+        labels = np.asarray(labels)
+        if len(labels) != self._rows:
+            raise ValueError(f"Expected {self._rows} labels, got {len(labels)}")
+        # Sorted labels with their slots, so lookups are a binary search
+        order = np.argsort(labels, kind='stable')
+        np.save(os.path.join(self.directory, 'labels.npy'), labels[order])
+        np.save(os.path.join(self.directory, 'slots.npy'), order)
+
+        columns = [{'name': name, 'stem': f"d{position}"} for position, name in enumerate(self.columns)]
+        with open(os.path.join(self.directory, DetailStore.MANIFEST), 'w') as f:
+            json.dump({'columns': columns}, f)
+        return DetailStore(directory=self.directory)
+
+    def _path(self, position, part):
+        return os.path.join(self.directory, f"d{position}.{part}")
@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+EMPTY_POSITIONS = np.empty(0, dtype=np.int64)
+
+
+def intersect_positions(left, right):
+    """
+    Intersect two sorted, duplicate-free position arrays
+
+    None stands for "every row" so an unfiltered side is free to combine.
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if len(left) > len(right):
+        left, right = right, left
+    if len(left) == 0:
+        return EMPTY_POSITIONS
+    # Binary-search the smaller array into the larger one
+    slots = np.searchsorted(right, left)
+    slots[slots == len(right)] = 0
+    return left[right[slots] == left]
+
+
+def union_positions(arrays):
+    """Merge sorted position arrays into one sorted array"""
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return EMPTY_POSITIONS
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+def group_positions(codes, n_groups):
+    """
+    Row positions for every code, as a CSR layout
+
+    Returns:
+        tuple: (positions sorted by code, offsets with n_groups + 1 entries)
+    """
+    valid = codes >= 0
+    positions = np.flatnonzero(valid)
+    order = np.argsort(codes[valid], kind='stable')
+    counts = np.bincount(codes[valid], minlength=n_groups)
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return positions[order], offsets
+
+
+def patch_codes(codes, values, sources, column):
+    """
+    Codes for a reordered column, reusing an existing vocabulary
+
+    Args:
+        codes (np.ndarray): code per old position
+        values (list): distinct values the codes refer to
+        sources (np.ndarray): old position per new position, -1 for new rows
+        column (pd.Series): values in the new order, read only for new rows
+
+    Returns:
+        tuple: (code per new position, values seen for the first time)
+    """
+    fresh = sources < 0
+    new_codes, uniques = pd.factorize(column[fresh])
+    ids = {value: i for i, value in enumerate(values)}
+    added = []
+    mapping = np.empty(len(uniques) + 1, dtype=np.int64)
+    mapping[-1] = -1
+    for i, value in enumerate(uniques):
+        if value not in ids:
+            ids[value] = len(values) + len(added)
+            added.append(value)
+        mapping[i] = ids[value]
+
+    patched = codes[np.where(fresh, 0, sources)] if len(codes) else np.full(len(sources), -1, dtype=np.int64)
+    patched = np.asarray(patched, dtype=np.int64)
+    patched[fresh] = mapping[new_codes]
+    return patched, added
+
+
+class ValueIndex:
+    """Hash map from each distinct column value to its sorted row positions"""
+
+    def __init__(self, column):
+        codes, uniques = pd.factorize(column)
+        self._set(codes, list(uniques))
+
+    def _set(self, codes, values):
+        self.codes = codes
+        self.values = values
+        self.positions, self.offsets = group_positions(codes, len(self.values))
+
+    def patched(self, sources, column):
+        """
+        Index over an updated catalogue, leaving this one untouched
+
+        Only rows without a source position are factorized; everything
+        else keeps its code, so the vocabulary is not rebuilt.
+        """
+        codes, added = patch_codes(self.codes, self.values, sources, column)
+        index = ValueIndex.__new__(ValueIndex)
+        index._set(codes, self.values + added)
+        return index
+
+    def lookup(self, predicate):
+        """
+        Rows whose value satisfies the predicate
+
+        The predicate runs once per distinct value, not once per row.
+
+        Returns:
+            np.ndarray: sorted row positions
+        """
+        return union_positions([
+            self.positions[self.offsets[i]:self.offsets[i + 1]]
+            for i, value in enumerate(self.values)
+            if predicate(value)
+        ])
+
+    def contains(self, text):
+        """
+        Rows whose value contains text, ignoring case
+
+        Text is plain, never a regex, so filter values from a request cannot
+        be malformed or backtrack
+        """
+        needle = text.lower()
+        return self.lookup(lambda value: needle in str(value).lower())
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to distinct lowercase search keys
+
+    Built over the lowercased key columns DataLoader precomputes, so answers
+    case-insensitive substring queries without lowercasing catalogue text:
+    the posting lists of the query's trigrams are intersected and the few
+    candidates confirmed with a plain `in` test. Results are the same as
+    Series.str.contains(text, case=False, na=False, regex=False) on the
+    original text.
+    """
+
+    def __init__(self, keys):
+        codes, uniques = pd.factorize(keys)
+        self.values = list(uniques)
+        self.strings = [str(value) for value in uniques]
+        self.codes = codes
+        self.positions, self.offsets = group_positions(codes, len(self.strings))
+        self.postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in self._grams(self.strings).items()}
+
+    @staticmethod
+    def _grams(strings, first_id=0):
+        """Trigram -> string ids posting lists for a run of strings"""
+        postings = {}
+        for string_id, string in enumerate(strings, start=first_id):
+            for gram in {string[i:i + 3] for i in range(len(string) - 2)}:
+                postings.setdefault(gram, []).append(string_id)
+        return postings
+
+    def patched(self, sources, keys):
+        """
+        Index over an updated catalogue, leaving this one untouched
+
+        Trigrams are only extracted for strings not seen before; their ids
+        are appended, so existing posting lists stay sorted.
+        """
+        codes, added = patch_codes(self.codes, self.values, sources, keys)
+        index = TrigramIndex.__new__(TrigramIndex)
+        index.values = self.values + added
+        index.strings = self.strings + [str(value) for value in added]
+        index.codes = codes
+        index.positions, index.offsets = group_positions(codes, len(index.strings))
+        index.postings = dict(self.postings)
+        for gram, ids in self._grams(index.strings[len(self.strings):], len(self.strings)).items():
+            ids = np.array(ids, dtype=np.int64)
+            index.postings[gram] = np.concatenate([index.postings[gram], ids]) if gram in index.postings else ids
+        return index
+
+    def contains(self, text):
+        """
+        Rows whose key contains text as a plain, case-insensitive substring
+
+        Returns:
+            np.ndarray: sorted row positions
+        """
+        needle = text.lower()
+        return union_positions([
+            self.positions[self.offsets[i]:self.offsets[i + 1]]
+            for i in self._candidates(needle)
+            if needle in self.strings[i]
+        ])
+
+    def _candidates(self, needle):
+        """String ids that contain every trigram of a lowercase plain-text needle"""
+        grams = {needle[i:i + 3] for i in range(len(needle) - 2)}
+        if not grams:
+            return range(len(self.strings))
+
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            ids = self.postings.get(gram)
+            if ids is None:
+                return []
+            candidates = intersect_positions(candidates, ids)
+            if len(candidates) == 0:
+                return []
+        return candidates.tolist()
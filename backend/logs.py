@@ -0,0 +1,54 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+# Every backend module logs under this name (logging.getLogger(__name__))
+LOGGER_NAME = 'backend'
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+
+_listener = None
+
+
+def configure_logging(level=logging.INFO, handler=None):
+    """
+    Route backend logs through a queue to a handler on a background thread
+
+    Callers only put records on an in-memory queue; formatting output and
+    writing it (stderr by default) happen on the listener thread, so a slow
+    console or file never blocks a search. Messages below `level` are
+    dropped before their arguments are formatted.
+
+    Args:
+        level (int): Minimum level, e.g. logging.DEBUG for per-query traces
+        handler (logging.Handler): Destination, a stderr StreamHandler by default
+
+    Returns:
+        logging.handlers.QueueListener: the running listener
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    if handler is None:
+        handler = logging.StreamHandler()
+    if handler.formatter is None:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    records = queue.SimpleQueue()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers = [logging.handlers.QueueHandler(records)]
+    logger.setLevel(level)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def _flush():
+    """Drain queued records before the interpreter exits"""
+    if _listener is not None:
+        _listener.stop()
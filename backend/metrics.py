@@ -0,0 +1,201 @@
+import bisect
+import json
+import threading
+import time
+
+# Histogram upper bounds: seconds for timings, row counts for stage sizes
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000, 10000000)
+
+METRIC_HELP = {
+    'stage_seconds': 'Time spent per query pipeline stage',
+    'filter_seconds': 'Time spent per filter step inside search',
+    'filter_rows': 'Rows surviving each filter step inside search',
+    'stage_rows': 'Rows returned by a pipeline stage',
+    'request_seconds': 'Time to answer an HTTP request, by route and status',
+    'cache_hits_total': 'Cache lookups answered from the cache',
+    'cache_misses_total': 'Cache lookups that had to compute',
+    'cache_hit_ratio': 'Share of cache lookups that hit',
+}
+
+
+class Histogram:
+    """Counts of observations per bucket, plus their sum and count"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        # One slot per bucket and a final +Inf slot
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, observations at or below it) pairs, ending with +Inf"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class _Span:
+    """Times a block into a latency histogram"""
+
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """
+    In-process registry of latency and row-count histograms
+
+    Histograms are keyed by a metric name and label values, e.g.
+    ('stage_seconds', stage='search'). Caches registered with track_cache()
+    are read at export time, so lookups themselves cost nothing extra. A
+    disabled registry (DISABLED) hands out a shared no-op span and ignores
+    observations, so instrumented code pays one attribute check.
+    """
+
+    def __init__(self, namespace='property_search', enabled=True):
+        self.namespace = namespace
+        self.enabled = enabled
+        self._histograms = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def span(self, name, **labels):
+        """
+        Context manager timing a block, e.g. `with metrics.span('stage_seconds', stage='parse'):`
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, labels)
+
+    def observe(self, name, value, **labels):
+        """Record one observation; bucket bounds follow from the metric name"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(
+                    LATENCY_BUCKETS if name.endswith('_seconds') else ROW_BUCKETS
+                )
+            histogram.observe(value)
+
+    def track_cache(self, name, cache):
+        """Export hit/miss counters of a ResultCache under cache=name"""
+        if self.enabled:
+            self._caches[name] = cache
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Current values as plain data
+
+        Returns:
+            dict: {'histograms': [...], 'caches': {name: counters}}
+        """
+        with self._lock:
+            histograms = [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'buckets': [[bound, count] for bound, count in histogram.cumulative()],
+                    'sum': histogram.sum,
+                    'count': histogram.count,
+                }
+                for (name, labels), histogram in sorted(self._histograms.items())
+            ]
+        caches = {}
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            caches[name] = {key: stats[key] for key in ('hits', 'misses', 'hit_rate', 'entries', 'evictions')}
+        return {'histograms': histograms, 'caches': caches}
+
+    def to_json(self, indent=None):
+        """snapshot() as a JSON document (the +Inf bound is written as "+Inf")"""
+        data = self.snapshot()
+        for histogram in data['histograms']:
+            histogram['buckets'][-1][0] = '+Inf'
+        return json.dumps(data, indent=indent)
+
+    def to_prometheus(self):
+        """snapshot() in the Prometheus text exposition format"""
+        data = self.snapshot()
+        lines = []
+        described = set()
+        for histogram in data['histograms']:
+            name = f"{self.namespace}_{histogram['name']}"
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {METRIC_HELP.get(histogram['name'], histogram['name'])}")
+                lines.append(f"# TYPE {name} histogram")
+            labels = histogram['labels']
+            for bound, count in histogram['buckets']:
+                lines.append(f"{name}_bucket{self._labels(labels, le=self._bound(bound))} {count}")
+            lines.append(f"{name}_sum{self._labels(labels)} {histogram['sum']!r}")
+            lines.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+
+        for metric, field, kind in (('cache_hits_total', 'hits', 'counter'),
+                                    ('cache_misses_total', 'misses', 'counter'),
+                                    ('cache_hit_ratio', 'hit_rate', 'gauge')):
+            if not data['caches']:
+                break
+            name = f"{self.namespace}_{metric}"
+            lines.append(f"# HELP {name} {METRIC_HELP[metric]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for cache, stats in data['caches'].items():
+                lines.append(f"{name}{self._labels({'cache': cache})} {stats[field]}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _bound(bound):
+        return '+Inf' if bound == float('inf') else repr(bound)
+
+    @staticmethod
+    def _labels(labels, **extra):
+        pairs = list(labels.items()) + list(extra.items())
+        if not pairs:
+            return ''
+        escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in pairs) + '}'
+
+
+# Shared registry for code that is not being measured
+DISABLED = Metrics(enabled=False)
@@ -1,10 +1,80 @@
 import re
+import unicodedata
 import pandas as pd
 
+from .cache import ResultCache
+
+# Common localities (case insensitive, matched on whole words)
+DEFAULT_LOCALITIES = [
+    'chembur', 'wakad', 'baner', 'kharadi', 'hinjewadi', 'whitefield',
+    'marathahalli', 'electronic city', 'ravet', 'mundhwa', 'andheri',
+    'mulund', 'thane', 'goregaon', 'borivali', 'powai', 'ghatkopar',
+    'shivajinagar', 'camp', 'punawale', 'mamurdi', 'pimpri', 'chinchwad',
+    'viman nagar', 'koregaon park', 'hadapsar', 'wagholi', 'undri',
+    'bavdhan', 'pashan', 'aundh', 'pimple saudagar', 'pimple nilakh',
+    'dhanori', 'sus', 'thergaon', 'dehu road', 'talegaon'
+]
+
+# Words that look like project names when capitalized but never are
+COMMON_WORDS = frozenset({
+    'show', 'find', 'search', 'looking', 'want', 'need', 'properties', 
+    'apartments', 'houses', 'homes', 'bhk', 'bedroom', 'ready', 'move',
+    'construction', 'near', 'under', 'above', 'below', 'crore', 'lakh',
+    'mumbai', 'pune', 'delhi', 'bangalore', 'city', 'area', 'locality'
+})
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Normalization applied before parsing and caching
+PUNCTUATION_PATTERN = re.compile(r'[!?,;:"()\[\]{}]')
+UNIT_GAP_PATTERN = re.compile(r'(\d)(?=(?:bhk|bedroom|crores?|cr|lakhs?|l)\b)', re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class LocalityMatcher:
+    """
+    Word-level trie over the locality gazetteer
+    
+    Finds the leftmost, longest locality made of whole words in a token list,
+    in time that depends on the query length rather than the gazetteer size.
+    """
+    
+    TERMINAL = object()
+    
+    def __init__(self, localities):
+        self.root = {}
+        for locality in localities:
+            words = WORD_PATTERN.findall(locality.lower())
+            if not words:
+                continue
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            # The first spelling registered for a word sequence wins
+            node.setdefault(self.TERMINAL, locality)
+    
+    def find(self, tokens):
+        """
+        Returns:
+            str or None: gazetteer entry of the leftmost-longest match
+        """
+        for start in range(len(tokens)):
+            node = self.root
+            match = None
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                match = node.get(self.TERMINAL, match)
+            if match is not None:
+                return match
+        return None
+
+
 class QueryParser:
     """Extract structured filters from natural language queries"""
     
-    def __init__(self):
+    def __init__(self, localities=None, cache_entries=1024):
         # Predefined patterns
         self.city_patterns = [
             r'\b(mumbai|pune|delhi|bangalore|bengaluru)\b',
@@ -27,16 +97,35 @@ class QueryParser:
             'under_construction': r'\b(under construction|upcoming|new launch|pre launch)\b',
         }
         
-        # Common localities (expanded list - case insensitive matching)
-        self.localities = [
-            'chembur', 'wakad', 'baner', 'kharadi', 'hinjewadi', 'whitefield',
-            'marathahalli', 'electronic city', 'ravet', 'mundhwa', 'andheri',
-            'mulund', 'thane', 'goregaon', 'borivali', 'powai', 'ghatkopar',
-            'shivajinagar', 'camp', 'punawale', 'mamurdi', 'pimpri', 'chinchwad',
-            'viman nagar', 'koregaon park', 'hadapsar', 'wagholi', 'undri',
-            'bavdhan', 'pashan', 'aundh', 'pimple saudagar', 'pimple nilakh',
-            'dhanori', 'sus', 'thergaon', 'dehu road', 'talegaon'
-        ]
+        # Common localities, matched with a word trie
+        self.localities = list(localities) if localities is not None else list(DEFAULT_LOCALITIES)
+        self.locality_matcher = LocalityMatcher(self.localities)
+        
+        # Compile every pattern once instead of going through the re cache per query
+        self.city_regexes = [re.compile(p) for p in self.city_patterns]
+        self.bhk_regexes = [re.compile(p) for p in self.bhk_patterns]
+        self.budget_regexes = [re.compile(p) for p in self.budget_patterns]
+        self.status_regexes = [(status, re.compile(p)) for status, p in self.status_patterns.items()]
+        
+        # Repeated queries skip all regex work
+        self.cache = ResultCache(max_entries=cache_entries)
+    
+    def cache_stats(self):
+        """Hit, miss and eviction counters of the parse/intent cache"""
+        return self.cache.stats()
+    
+    @staticmethod
+    def normalize(query):
+        """
+        Canonical spelling of a query: NFKC unicode (so '₨' becomes 'Rs' and
+        full-width digits become ASCII), no stray punctuation, a space between
+        a number and its unit ('2BHK' -> '2 BHK'), single spaces. Case is kept
+        because capitalized words are project name candidates.
+        """
+        text = unicodedata.normalize('NFKC', query)
+        text = PUNCTUATION_PATTERN.sub(' ', text)
+        text = UNIT_GAP_PATTERN.sub(r'\1 ', text)
+        return WHITESPACE_PATTERN.sub(' ', text).strip()
     
     def parse(self, query):
         """
@@ -52,6 +141,27 @@ class QueryParser:
                 'project_name': str or None (if mentioned)
             }
         """
+        normalized = self.normalize(query)
+        # Everything except the project name is read from the lowercased
+        # text, so the key only keeps case through the project name words
+        key = ('parse', normalized.lower(), tuple(self._project_name_words(normalized)))
+        hit, filters = self.cache.get(key)
+        if not hit:
+            filters = self._parse(normalized)
+            self.cache.put(key, filters)
+        return dict(filters)
+    
+    def _project_name_words(self, query):
+        """Capitalized words that may name a project"""
+        # Only extract if it looks like a real project name (not common query words)
+        words = query.split()
+        capitalized = [w for w in words if w and w[0].isupper() and len(w) > 3]
+        
+        # Filter out common words
+        return [w for w in capitalized if w.lower() not in COMMON_WORDS]
+    
+    def _parse(self, query):
+        """Uncached implementation of parse() on a normalized query"""
         query_lower = query.lower()
         filters = {
             'city': None,
@@ -63,22 +173,22 @@ class QueryParser:
         }
         
         # Extract city
-        for pattern in self.city_patterns:
-            match = re.search(pattern, query_lower)
+        for regex in self.city_regexes:
+            match = regex.search(query_lower)
             if match:
                 filters['city'] = match.group(1).title()
                 break
         
         # Extract BHK
-        for pattern in self.bhk_patterns:
-            match = re.search(pattern, query_lower)
+        for regex in self.bhk_regexes:
+            match = regex.search(query_lower)
             if match:
                 filters['bhk'] = int(match.group(1))
                 break
         
         # Extract budget
-        for pattern in self.budget_patterns:
-            match = re.search(pattern, query_lower)
+        for regex in self.budget_regexes:
+            match = regex.search(query_lower)
             if match:
                 amount = float(match.group(1))
                 unit = match.group(2).lower()
@@ -91,31 +201,18 @@ class QueryParser:
                 break
         
         # Extract status
-        for status, pattern in self.status_patterns.items():
-            if re.search(pattern, query_lower):
+        for status, regex in self.status_regexes:
+            if regex.search(query_lower):
                 filters['status'] = status.replace('_', ' ').title()
                 break
         
-        # Extract locality
-        for locality in self.localities:
-            if locality in query_lower:
-                filters['locality'] = locality.title()
-                break
+        # Extract locality (whole words, longest match)
+        locality = self.locality_matcher.find(WORD_PATTERN.findall(query_lower))
+        if locality:
+            filters['locality'] = locality.title()
         
         # Try to extract project name - IMPROVED LOGIC
-        # Only extract if it looks like a real project name (not common query words)
-        common_words = {
-            'show', 'find', 'search', 'looking', 'want', 'need', 'properties', 
-            'apartments', 'houses', 'homes', 'bhk', 'bedroom', 'ready', 'move',
-            'construction', 'near', 'under', 'above', 'below', 'crore', 'lakh',
-            'mumbai', 'pune', 'delhi', 'bangalore', 'city', 'area', 'locality'
-        }
-        
-        words = query.split()
-        capitalized = [w for w in words if w and w[0].isupper() and len(w) > 3]
-        
-        # Filter out common words
-        capitalized = [w for w in capitalized if w.lower() not in common_words]
+        capitalized = self._project_name_words(query)
         
         # Only set project name if we have 1-3 real capitalized words
         if capitalized and len(capitalized) <= 3:
@@ -125,8 +222,16 @@ class QueryParser:
     
     def extract_intent(self, query):
         """Determine user intent"""
-        query_lower = query.lower()
-        
+        query_lower = self.normalize(query).lower()
+        key = ('intent', query_lower)
+        hit, intent = self.cache.get(key)
+        if not hit:
+            intent = self._intent(query_lower)
+            self.cache.put(key, intent)
+        return intent
+    
+    def _intent(self, query_lower):
+        """Uncached implementation of extract_intent()"""
         if any(word in query_lower for word in ['show', 'find', 'search', 'looking', 'want', 'need']):
             return 'search'
         elif any(word in query_lower for word in ['compare', 'difference', 'vs', 'versus']):
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+# Column kinds used in the declarations below
+TEXT = 'str'
+NUMBER = 'float64'
+FLAG = 'boolean'
+CATEGORY = 'category'
+
+# Parser for full reads; 'pyarrow' parses multithreaded where it is installed.
+# Chunked reads always use the C parser, the only one that streams.
+PARSER_ENGINE = 'c'
+
+
+class TableSchema:
+    """
+    Declared layout of one source CSV
+
+    Dtypes are fixed up front so the parser never has to infer them (which
+    means scanning the wide quoted text fields), and for the compact
+    catalogue only the columns it uses are parsed at all. Numbers arrive
+    typed, so nothing downstream re-coerces them.
+    """
+
+    def __init__(self, file_name, columns, used, required=()):
+        self.file_name = file_name
+        self.columns = columns
+        self.used = used
+        self.required = required
+
+    def read(self, path, subset=True, engine=None):
+        """
+        Parse and validate the whole file
+
+        Args:
+            path (str): CSV to read, laid out like file_name
+            subset (bool): Parse only the declared `used` columns
+            engine (str): Parser engine, PARSER_ENGINE by default
+
+        Returns:
+            tuple: (valid rows, rejected rows with a `reason` column)
+        """
+        header = self._header(path)
+        try:
+            frame = pd.read_csv(path, **self._options(header, subset, engine=engine))
+        except ValueError:
+            # A malformed number somewhere: parse numbers as text and let
+            # validate() reject the offending rows instead of failing the load
+            frame = pd.read_csv(path, **self._options(header, subset, lenient=True, engine=engine))
+        return self.validate(frame)
+
+    def read_chunks(self, path, chunksize, subset=True):
+        """
+        Like read(), one chunk of rows at a time
+
+        Yields:
+            tuple: (valid rows, rejected rows) per chunk
+        """
+        header = self._header(path)
+        rows = 0
+        reader = pd.read_csv(path, chunksize=chunksize, **self._options(header, subset, engine='c'))
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except ValueError:
+                # Continue after the rows already handed out, numbers as text
+                reader = pd.read_csv(path, chunksize=chunksize, skiprows=range(1, rows + 1),
+                                     **self._options(header, subset, lenient=True, engine='c'))
+                continue
+            rows += len(chunk)
+            yield self.validate(chunk)
+
+    def validate(self, frame):
+        """
+        Split a parsed frame into valid and rejected rows
+
+        Rows are rejected when a required column is empty or holds text
+        that is not a number. Malformed numbers in optional columns are
+        cleared to missing, as pd.to_numeric(errors='coerce') used to do.
+
+        Returns:
+            tuple: (valid rows, rejected rows with a `reason` column)
+        """
+        problems = []
+        for column, kind in self.columns.items():
+            if kind == NUMBER and column in frame.columns and not pd.api.types.is_numeric_dtype(frame[column]):
+                values = pd.to_numeric(frame[column], errors='coerce').astype(NUMBER)
+                if column in self.required:
+                    problems.append((values.isna() & frame[column].notna(), f"invalid {column}"))
+                frame[column] = values
+        for column in self.required:
+            if column in frame.columns:
+                problems.append((frame[column].isna(), f"missing {column}"))
+
+        masks = [mask.to_numpy(dtype=bool) for mask, _ in problems]
+        bad = np.logical_or.reduce(masks) if masks else np.zeros(len(frame), dtype=bool)
+        if not bad.any():
+            return frame, frame.iloc[:0].assign(reason=pd.Series(dtype=TEXT))
+        # First failing rule per row
+        reasons = np.select(masks, [reason for _, reason in problems], default='')
+        return frame[~bad], frame[bad].assign(reason=reasons[bad])
+
+    def _options(self, header, subset, lenient=False, engine=None):
+        """read_csv keyword arguments for this file"""
+        wanted = [column for column in header if not subset or column in self.used]
+        dtype = {
+            column: TEXT if lenient and kind == NUMBER else kind
+            for column, kind in self.columns.items()
+            if column in wanted
+        }
+        return {
+            'usecols': wanted if subset else None,
+            'dtype': dtype,
+            'engine': engine or PARSER_ENGINE,
+        }
+
+    @staticmethod
+    def _header(path):
+        return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+PROJECTS = TableSchema(
+    'project.csv',
+    columns={
+        'id': TEXT, 'projectType': CATEGORY, 'projectName': TEXT,
+        'projectCategory': CATEGORY, 'slug': TEXT, 'slugId': NUMBER,
+        'status': CATEGORY, 'projectAge': NUMBER, 'reraId': TEXT,
+        'countryId': TEXT, 'stateId': TEXT, 'cityId': TEXT, 'localityId': TEXT,
+        'subLocalityId': TEXT, 'projectSummary': TEXT, 'possessionDate': TEXT,
+    },
+    used=['id', 'projectName', 'projectCategory', 'slug', 'status',
+          'reraId', 'projectSummary', 'possessionDate'],
+    required=['id', 'projectName'],
+)
+
+CONFIGURATIONS = TableSchema(
+    'ProjectConfiguration.csv',
+    columns={
+        'id': TEXT, 'projectId': TEXT, 'propertyCategory': CATEGORY,
+        'type': CATEGORY, 'customBHK': TEXT,
+    },
+    used=['id', 'projectId', 'type'],
+    required=['id', 'projectId'],
+)
+
+VARIANTS = TableSchema(
+    'ProjectConfigurationVariant.csv',
+    columns={
+        'id': TEXT, 'configurationId': TEXT, 'bathrooms': NUMBER,
+        'privateBathrooms': NUMBER, 'publicBathrooms': NUMBER, 'balcony': NUMBER,
+        'furnishedType': TEXT, 'furnishingType': TEXT, 'lift': FLAG,
+        'ageOfProperty': NUMBER, 'parkingType': TEXT, 'listingType': CATEGORY,
+        'floorPlanImage': TEXT, 'carpetArea': NUMBER, 'price': NUMBER,
+        'propertyImages': TEXT, 'maintenanceCharges': TEXT, 'aboutProperty': TEXT,
+        'createdAt': TEXT, 'updatedAt': TEXT,
+    },
+    used=['id', 'configurationId', 'bathrooms', 'balcony', 'furnishedType',
+          'floorPlanImage', 'carpetArea', 'price', 'propertyImages',
+          'maintenanceCharges', 'aboutProperty', 'createdAt', 'updatedAt'],
+    required=['id', 'configurationId', 'price'],
+)
+
+ADDRESSES = TableSchema(
+    'ProjectAddress.csv',
+    columns={
+        'id': TEXT, 'projectId': TEXT, 'landmark': TEXT,
+        'fullAddress': TEXT, 'pincode': TEXT,
+    },
+    used=['projectId', 'landmark', 'fullAddress'],
+    required=['projectId'],
+)
+
+SOURCE_SCHEMAS = [PROJECTS, CONFIGURATIONS, VARIANTS, ADDRESSES]
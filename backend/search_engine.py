@@ -1,14 +1,254 @@
+import copy
+import logging
+import numpy as np
 import pandas as pd
-import re
+
+from .cache import ResultCache
+from .cube import FacetCube, cube_values
+from .data_loader import LOCALITY_NAMES, SEARCH_KEY_COLUMNS, DataLoader
+from .metrics import DISABLED
+from .indexes import TrigramIndex, ValueIndex, intersect_positions, union_positions
+from .stats import PRICE_BAND_LABELS, FacetStats, price_band_codes
+
+logger = logging.getLogger(__name__)
+
+# Columns read by Summarizer.format_property_cards, get_statistics and callers
+RESULT_COLUMNS = [
+    'projectName', 'type', 'bhk', 'price_cr', 'status', 'city', 'fullAddress',
+    'landmark', 'furnishing', 'carpetArea', 'balcony', 'slug', 'projectCategory',
+    'locality',
+]
+
+DEDUP_COLUMNS = ['projectName', 'type', 'price_cr']
+
+# Order filters are applied in, with the label used in logs
+FILTER_ORDER = ['city', 'bhk', 'budget_max', 'status', 'locality', 'project_name']
+FILTER_LABELS = {
+    'city': 'city',
+    'bhk': 'BHK',
+    'budget_max': 'budget',
+    'status': 'status',
+    'locality': 'locality',
+    'project_name': 'project name',
+}
+
+class SearchIndex:
+    """
+    Everything a query reads, built for one version of the catalogue
+    
+    The catalogue is presorted by price once, so every index hands out
+    positions in price order: filtered positions are already sorted, and
+    the budget filter is a binary search on the price column. A bundle is
+    never modified after construction; updates build a new one.
+    """
+    
+    def __init__(self, dataframe, version=0, previous=None, changed=()):
+        prices = dataframe['price_cr'].to_numpy(dtype=np.float64)
+        order = np.argsort(prices, kind='stable')
+        ranked = dataframe[[c for c in RESULT_COLUMNS if c in dataframe.columns]].iloc[order]
+        
+        self.version = version
+        self.prices = prices[order]
+        self.result_frame = ranked
+        self.row_labels = ranked.index.to_numpy()
+        self.label_positions = pd.Index(self.row_labels)
+        self.label_slots = self._label_slots(self.row_labels)
+        keys = {column: self._keys(dataframe, column).iloc[order] for column in SEARCH_KEY_COLUMNS}
+        
+        if previous is None:
+            self.city_index = ValueIndex(ranked['city'])
+            self.status_index = ValueIndex(ranked['status'])
+            self.bhk_index = ValueIndex(ranked['bhk'])
+            self.locality_index = ValueIndex(ranked['locality'])
+            self.furnishing_index = ValueIndex(ranked['furnishing'])
+            self.address_index = TrigramIndex(keys['fullAddress'])
+            self.landmark_index = TrigramIndex(keys['landmark'])
+            self.project_index = TrigramIndex(keys['projectName'])
+        else:
+            # Unchanged rows keep their codes; only changed rows are indexed
+            sources = pd.Index(previous.row_labels).get_indexer(self.row_labels)
+            sources[np.isin(self.row_labels, np.asarray(changed))] = -1
+            self.city_index = previous.city_index.patched(sources, ranked['city'])
+            self.status_index = previous.status_index.patched(sources, ranked['status'])
+            self.bhk_index = previous.bhk_index.patched(sources, ranked['bhk'])
+            self.locality_index = previous.locality_index.patched(sources, ranked['locality'])
+            self.furnishing_index = previous.furnishing_index.patched(sources, ranked['furnishing'])
+            self.address_index = previous.address_index.patched(sources, keys['fullAddress'])
+            self.landmark_index = previous.landmark_index.patched(sources, keys['landmark'])
+            self.project_index = previous.project_index.patched(sources, keys['projectName'])
+        
+        # Rows mentioning each gazetteer locality, so the parser's locality
+        # filter is a dictionary lookup rather than two substring searches
+        self.locality_positions = {
+            name.lower(): union_positions([
+                self.address_index.contains(name),
+                self.landmark_index.contains(name),
+            ])
+            for name in LOCALITY_NAMES
+        }
+        
+        # Facet counts reuse the value indexes' integer codes
+        bands = price_band_codes(self.prices)
+        self.facets = FacetStats(self.prices, {
+            'locality': (self.locality_index.codes, self.locality_index.values),
+            'status': (self.status_index.codes, self.status_index.values),
+            'bhk': (self.bhk_index.codes, self.bhk_index.values),
+            'furnishing': (self.furnishing_index.codes, self.furnishing_index.values),
+            'price_band': (bands, PRICE_BAND_LABELS),
+        })
+        
+        # Dashboard aggregates; a patched bundle only folds in the changed rows
+        dimensions = {'city': self.city_index, 'bhk': self.bhk_index, 'status': self.status_index}
+        codes = {name: value_index.codes for name, value_index in dimensions.items()}
+        codes['price_band'] = bands
+        if previous is None:
+            self.cube = FacetCube.build(codes, cube_values(dimensions), self.prices)
+        else:
+            gone = np.ones(len(previous.prices), dtype=bool)
+            gone[sources[sources >= 0]] = False
+            removed = {name: getattr(previous, f"{name}_index").codes[gone] for name in dimensions}
+            removed['price_band'] = price_band_codes(previous.prices[gone])
+            fresh = sources < 0
+            added = {name: row_codes[fresh] for name, row_codes in codes.items()}
+            self.cube = previous.cube.updated(
+                (removed, previous.prices[gone]),
+                (added, self.prices[fresh]),
+                (codes, self.prices),
+                cube_values(dimensions),
+            )
+        
+        # One integer per (project, configuration, price) for deduplication
+        self.dedup_keys = ranked.groupby(DEDUP_COLUMNS, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    
+    def patched(self, dataframe, changed=()):
+        """
+        Bundle for an updated catalogue, reusing this bundle's indexes
+        
+        Args:
+            dataframe (pd.DataFrame): the complete updated catalogue
+            changed (array-like): labels of rows whose values changed
+        """
+        return SearchIndex(dataframe, self.version + 1, previous=self, changed=changed)
+    
+    def positions_of(self, labels):
+        """Position of each row label in this bundle, -1 for labels it does not hold"""
+        labels = np.asarray(labels)
+        if self.label_slots is None or labels.dtype.kind not in 'iu':
+            return self.label_positions.get_indexer(labels)
+        positions = np.full(len(labels), -1, dtype=np.int64)
+        inside = (labels >= 0) & (labels < len(self.label_slots))
+        positions[inside] = self.label_slots[labels[inside]]
+        return positions
+    
+    @staticmethod
+    def _label_slots(labels):
+        """
+        Dense label -> position array for small non-negative integer labels
+        
+        Loaded catalogues are labelled 0..n with gaps, so a plain array
+        answers label lookups without the hash table pd.Index builds, and
+        can be shared between processes like any other index array.
+        """
+        if labels.dtype.kind not in 'iu' or len(labels) == 0:
+            return None
+        if labels.min() < 0 or labels.max() >= 4 * len(labels) + 1024:
+            return None
+        slots = np.full(int(labels.max()) + 1, -1, dtype=np.int64)
+        slots[labels] = np.arange(len(labels))
+        return slots
+    
+    @staticmethod
+    def _keys(dataframe, column):
+        """Precomputed lowercase search key of a text column, derived here if absent"""
+        key = SEARCH_KEY_COLUMNS[column]
+        if key in dataframe.columns:
+            return dataframe[key]
+        return pd.Series(DataLoader._search_key(dataframe[column]), index=dataframe.index)
+
 
 class SearchEngine:
     """Search and filter properties based on parsed query filters"""
     
-    def __init__(self, dataframe):
+    def __init__(self, dataframe, cache_entries=512, cache_bytes=64 * 1024 * 1024, cache_ttl=None, metrics=None, index=None):
         self.df = dataframe
-        print(f"[SearchEngine] Initialized with {len(dataframe)} properties")
-        print(f"[SearchEngine] Cities available: {dataframe['city'].unique().tolist()}")
-        print(f"[SearchEngine] Price range: ₹{dataframe['price_cr'].min():.2f} Cr to ₹{dataframe['price_cr'].max():.2f} Cr")
+        self.cache = ResultCache(max_entries=cache_entries, max_bytes=cache_bytes, ttl=cache_ttl)
+        # Stage and filter-step timings, off unless a metrics.Metrics is passed
+        self.metrics = metrics or DISABLED
+        self.metrics.track_cache('search', self.cache)
+        # An index built elsewhere (e.g. attached from a SharedCatalogue) is used as is
+        self.index = index if index is not None else SearchIndex(dataframe)
+        logger.info("Initialized with %d properties", len(dataframe))
+        # Full-frame aggregations, only worth computing when someone reads them
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cities available: %s", dataframe['city'].unique().tolist())
+            logger.debug("Price range: ₹%.2f Cr to ₹%.2f Cr", dataframe['price_cr'].min(), dataframe['price_cr'].max())
+    
+    def reload(self, dataframe):
+        """Swap in a freshly loaded catalogue, rebuilding indexes and dropping cached results"""
+        self._publish(dataframe, SearchIndex(dataframe, self.index.version + 1))
+    
+    def refresh(self, dataframe, upserted=(), removed=()):
+        """
+        Apply an incremental catalogue update, e.g. from DataLoader.refresh
+        
+        Indexes are patched rather than rebuilt: only upserted rows are
+        factorized and tokenized. The new indexes are assembled on the
+        side and published with a single assignment, so a query already
+        running finishes against the old catalogue and never sees a mix.
+        
+        Args:
+            dataframe (pd.DataFrame): the complete updated catalogue
+            upserted (array-like): labels of inserted or changed rows
+            removed (array-like): labels no longer in the catalogue
+        """
+        self._publish(dataframe, self.index.patched(dataframe, changed=upserted))
+        logger.info("Refreshed: %d upserted, %d removed, %d properties", len(upserted), len(removed), len(dataframe))
+    
+    def _publish(self, dataframe, index):
+        # Cache keys carry the index version, so a result computed against
+        # the old bundle can never be served for the new one
+        self.index = index
+        self.df = dataframe
+        self.cache.clear()
+    
+    @property
+    def cube(self):
+        """
+        Pre-aggregated city x BHK x status x price band metrics of the catalogue
+        
+        e.g. search_engine.cube.totals(), cube.breakdown('city')
+        """
+        return self.index.cube
+    
+    def cache_stats(self):
+        """Hit, miss and eviction counters of the result cache"""
+        return self.cache.stats()
+    
+    @staticmethod
+    def cache_key(filters):
+        """
+        Canonical, hashable form of a filters dict
+        
+        Unset filters are dropped since they never affect results, and text
+        values are lowercased since every text filter matches case-insensitively.
+        """
+        return tuple(sorted(
+            (name, value.lower() if isinstance(value, str) else value)
+            for name, value in filters.items()
+            if value
+        ))
+    
+    def _cached(self, key, compute):
+        """Serve from the result cache, computing and storing on a miss"""
+        if self.cache.max_entries <= 0:
+            # Nothing is stored, so the fresh value is the caller's alone
+            return compute()
+        hit, value = self.cache.get(key)
+        if not hit:
+            value = compute()
+            self.cache.put(key, value)
+        # Hand out copies so callers cannot mutate cached results
+        return copy.deepcopy(value)
     
     def search(self, filters, top_n=10):
         """
@@ -21,90 +261,210 @@ class SearchEngine:
         Returns:
             pd.DataFrame: Filtered results
         """
-        results = self.df.copy()
-        initial_count = len(results)
+        index = self.index
+        key = (index.version, 'search', self.cache_key(filters), top_n)
+        with self.metrics.span('stage_seconds', stage='search'):
+            results = self._cached(key, lambda: self._search(index, filters, top_n))
+        self.metrics.observe('stage_rows', len(results), stage='search')
+        return results
+    
+    def _search(self, index, filters, top_n):
+        """Uncached implementation of search() against one index bundle"""
+        initial_count = len(index.prices)
+        metrics = self.metrics
+        
+        logger.debug("Starting with %d properties", initial_count)
+        logger.debug("Filters: %s", filters)
+        
+        # Every filter narrows a sorted array of row positions (None = all rows)
+        positions = None
+        for name in FILTER_ORDER:
+            value = filters.get(name)
+            if not value:
+                continue
+            with metrics.span('filter_seconds', filter=name):
+                if name == 'budget_max':
+                    positions = self._under_budget(index, positions, value)
+                else:
+                    part = self._filter_part(index, name, value)
+                    if part is None:
+                        continue
+                    positions = intersect_positions(positions, part)
+            metrics.observe('filter_rows', len(positions), filter=name)
+            logger.debug("After %s filter: %d properties", FILTER_LABELS[name], len(positions))
+        
+        # Positions are already in price order, so deduplicate by streaming
+        # through them and stop once top_n distinct rows are collected
+        with metrics.span('filter_seconds', filter='dedup'):
+            top_positions = self._first_unique(index, positions, top_n)
+        metrics.observe('filter_rows', len(top_positions), filter='dedup')
+        
+        logger.debug("Final results (after dedup): %d properties", len(top_positions))
+        
+        # Materialize only the top N rows, and only the columns callers read
+        with metrics.span('filter_seconds', filter='materialize'):
+            return index.result_frame.iloc[top_positions]
+    
+    def _filter_positions(self, index, filters, memo=None):
+        """
+        Row positions allowed by each active filter, evaluated independently
         
-        print(f"\n[Search] Starting with {initial_count} properties")
-        print(f"[Search] Filters: {filters}")
+        The budget is left out since it is a cutoff on the price order
+        rather than a position set (see _under_budget).
         
-        # Apply city filter - IMPROVED to handle missing cities
-        if filters.get('city'):
-            city_results = results[
-                results['city'].str.contains(filters['city'], case=False, na=False)
-            ]
+        Args:
+            index (SearchIndex): Bundle to evaluate against
+            filters (dict): Extracted filters from query parser
+            memo (dict): Optional cache of filter parts shared across queries
             
-            # If city filter returns nothing, try matching city in address
-            if len(city_results) == 0:
-                city_results = results[
-                    results['fullAddress'].str.contains(filters['city'], case=False, na=False)
-                ]
+        Returns:
+            dict: {filter name: sorted positions}
+        """
+        parts = {}
+        for name in FILTER_ORDER:
+            value = filters.get(name)
+            if not value or name == 'budget_max':
+                continue
+            
+            key = (name, value.lower() if isinstance(value, str) else value)
+            if memo is not None and key in memo:
+                part = memo[key]
+            else:
+                part = self._filter_part(index, name, value)
+                if memo is not None:
+                    memo[key] = part
+            
+            if part is not None:
+                parts[name] = part
+        return parts
+    
+    def _filter_part(self, index, name, value):
+        """Sorted positions matching a single filter, None if it does not restrict"""
+        # City filter - falls back to the address for rows without a city
+        if name == 'city':
+            city_positions = index.city_index.contains(value)
             
-            results = city_results
-            print(f"[Search] After city filter: {len(results)} properties")
-        
-        # Apply BHK filter (with tolerance)
-        if filters.get('bhk'):
-            bhk_value = filters['bhk']
-            results = results[
-                (results['bhk'] >= bhk_value - 0.5) & 
-                (results['bhk'] <= bhk_value + 0.5)
-            ]
-            print(f"[Search] After BHK filter: {len(results)} properties")
-        
-        # Apply budget filter
-        if filters.get('budget_max'):
-            results = results[results['price_cr'] <= filters['budget_max']]
-            print(f"[Search] After budget filter: {len(results)} properties")
-        
-        # Apply status filter - IMPROVED MATCHING
-        if filters.get('status'):
-            status_query = filters['status'].lower()
-            # Match partial status
+            # If city filter returns nothing, try matching city in address
+            if len(city_positions) == 0:
+                city_positions = index.address_index.contains(value)
+            return city_positions
+        
+        # BHK filter (with tolerance)
+        if name == 'bhk':
+            return index.bhk_index.lookup(lambda bhk: value - 0.5 <= bhk <= value + 0.5)
+        
+        # Status filter - partial matching
+        if name == 'status':
+            status_query = value.lower()
             if 'ready' in status_query:
-                results = results[
-                    results['status'].str.contains('Ready', case=False, na=False)
-                ]
-            elif 'construction' in status_query or 'under' in status_query:
-                results = results[
-                    results['status'].str.contains('Construction', case=False, na=False)
-                ]
-            print(f"[Search] After status filter: {len(results)} properties")
-        
-        # Apply locality filter - more flexible matching
-        if filters.get('locality'):
-            locality = filters['locality']
-            # Try matching in fullAddress, landmark, and even projectName
-            locality_mask = (
-                results['fullAddress'].str.contains(locality, case=False, na=False) |
-                results['landmark'].str.contains(locality, case=False, na=False)
-            )
-            results = results[locality_mask]
-            print(f"[Search] After locality filter '{locality}': {len(results)} properties")
-        
-        # Apply project name filter
-        if filters.get('project_name'):
-            results = results[
-                results['projectName'].str.contains(
-                    filters['project_name'], 
-                    case=False, 
-                    na=False
-                )
-            ]
-            print(f"[Search] After project name filter: {len(results)} properties")
-        
-        # Sort by price (ascending)
-        results = results.sort_values('price_cr')
-        
-        # Remove duplicates based on project + configuration
-        results = results.drop_duplicates(
-            subset=['projectName', 'type', 'price_cr'],
-            keep='first'
-        )
-        
-        print(f"[Search] Final results (after dedup): {len(results)} properties")
-        
-        # Return top N results
-        return results.head(top_n)
+                return index.status_index.contains('Ready')
+            if 'construction' in status_query or 'under' in status_query:
+                return index.status_index.contains('Construction')
+            return None
+        
+        # Locality filter - matches fullAddress or landmark
+        if name == 'locality':
+            positions = index.locality_positions.get(value.lower())
+            if positions is not None:
+                return positions
+            return union_positions([
+                index.address_index.contains(value),
+                index.landmark_index.contains(value),
+            ])
+        
+        # Project name filter
+        if name == 'project_name':
+            return index.project_index.contains(value)
+        
+        return None
+    
+    def _combine(self, index, parts, budget_max):
+        """Intersect filter position sets and apply the budget cutoff"""
+        positions = None
+        for part in sorted(parts.values(), key=len):
+            positions = intersect_positions(positions, part)
+        if budget_max:
+            positions = self._under_budget(index, positions, budget_max)
+        return positions
+    
+    def search_many(self, filters_list, top_n=10):
+        """
+        Evaluate a batch of filter dicts, e.g. stored saved-search alerts
+        
+        Queries that differ only in budget form one group: their shared
+        filters are intersected once, and because positions are in price
+        order every budget is just a cutoff into the group's deduplicated
+        top rows. Single-filter position sets are also reused across groups.
+        
+        Args:
+            filters_list (list): Filter dicts from the query parser
+            top_n (int): Maximum number of results per query
+            
+        Returns:
+            list: np.ndarray of result row labels (self.df index) per query,
+                  in the same order search() would return them
+        """
+        groups = {}
+        for i, filters in enumerate(filters_list):
+            shared = {name: value for name, value in filters.items() if name != 'budget_max'}
+            groups.setdefault(self.cache_key(shared), []).append(i)
+        
+        index = self.index
+        memo = {}
+        results = [None] * len(filters_list)
+        for key, members in groups.items():
+            parts = self._filter_positions(index, dict(key), memo)
+            top_positions = np.asarray(self._first_unique(index, self._combine(index, parts, None), top_n), dtype=np.int64)
+            
+            # One vectorized cutoff for every budget in the group
+            budgets = np.array([filters_list[i].get('budget_max') or np.nan for i in members], dtype=np.float64)
+            cutoffs = np.searchsorted(index.prices, budgets, side='right')
+            # Queries without a budget keep every row, unpriced ones included
+            cutoffs[np.isnan(budgets)] = len(index.prices)
+            counts = np.searchsorted(top_positions, cutoffs)
+            
+            labels = index.row_labels[top_positions]
+            for i, count in zip(members, counts.tolist()):
+                results[i] = labels[:count]
+        return results
+    
+    def _under_budget(self, index, positions, budget_max):
+        """Keep positions priced at or below the budget via binary search"""
+        cutoff = np.searchsorted(index.prices, budget_max, side='right')
+        if positions is None:
+            return np.arange(cutoff)
+        return positions[:np.searchsorted(positions, cutoff)]
+    
+    def _first_unique(self, index, positions, top_n):
+        """
+        First top_n positions whose (project, type, price) was not seen before
+        
+        Args:
+            index (SearchIndex): Bundle the positions refer to
+            positions (np.ndarray or None): sorted positions, None for all rows
+            top_n (int): number of distinct rows wanted
+            
+        Returns:
+            list: positions in price order
+        """
+        total = len(index.prices) if positions is None else len(positions)
+        chunk_size = max(2 * top_n, 64)
+        picked = []
+        seen = set()
+        
+        for start in range(0, total, chunk_size):
+            if len(picked) >= top_n:
+                break
+            stop = min(start + chunk_size, total)
+            block = np.arange(start, stop) if positions is None else positions[start:stop]
+            for position, key in zip(block.tolist(), index.dedup_keys[block].tolist()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                picked.append(position)
+                if len(picked) >= top_n:
+                    break
+        return picked
     
     def get_statistics(self, results, filters):
         """
@@ -113,31 +473,46 @@ class SearchEngine:
         Returns:
             dict: Statistics like count, avg price, localities, etc.
         """
-        if results.empty:
-            return {
-                'count': 0,
-                'avg_price': 0,
-                'min_price': 0,
-                'max_price': 0,
-                'localities': [],
-                'statuses': [],
-                'bhk_types': []
-            }
-        
-        stats = {
-            'count': len(results),
-            'avg_price': results['price_cr'].mean(),
-            'min_price': results['price_cr'].min(),
-            'max_price': results['price_cr'].max(),
-            'localities': results['fullAddress'].str.extract(
-                r'(Chembur|Wakad|Baner|Kharadi|Ravet|Mundhwa|Andheri|Mulund|Shivajinagar|Punawale)', 
-                flags=re.IGNORECASE
-            )[0].dropna().unique().tolist(),
-            'statuses': results['status'].unique().tolist(),
-            'bhk_types': sorted(results['bhk'].dropna().unique().tolist())
-        }
+        # Statistics depend only on which rows are in the results
+        index = self.index
+        key = (index.version, 'statistics', tuple(results.index.tolist()))
+        with self.metrics.span('stage_seconds', stage='get_statistics'):
+            return self._cached(key, lambda: self._statistics(index, results))
+    
+    def _statistics(self, index, results):
+        """Uncached implementation of get_statistics()"""
+        positions = index.positions_of(results.index)
+        if (positions < 0).any():
+            # Rows from another catalogue version: aggregate the frame itself
+            return FacetStats.from_frame(results).summary()
+        return index.facets.summary(positions)
+    
+    def facet_counts(self, filters, facets=None):
+        """
+        Facet counts over every row matching the filters, not just the top N
+        
+        Counts are per catalogue row (before deduplication), e.g. for
+        sidebar filters showing how many listings each choice would keep.
         
-        return stats
+        Args:
+            filters (dict): Extracted filters from query parser
+            facets (list): Facets to count, see stats.FACETS; all by default
+            
+        Returns:
+            dict: {'count', 'avg_price', 'min_price', 'max_price',
+                   facet name: {value: rows}}
+        """
+        index = self.index
+        names = tuple(facets) if facets is not None else None
+        key = (index.version, 'facets', self.cache_key(filters), names)
+        with self.metrics.span('stage_seconds', stage='facet_counts'):
+            return self._cached(key, lambda: self._facet_counts(index, filters, names))
+    
+    def _facet_counts(self, index, filters, names):
+        """Uncached implementation of facet_counts()"""
+        parts = self._filter_positions(index, filters)
+        positions = self._combine(index, parts, filters.get('budget_max'))
+        return index.facets.counts(positions, names)
     
     def expand_search(self, filters):
         """
@@ -146,35 +521,39 @@ class SearchEngine:
         Returns:
             pd.DataFrame: Results with relaxed filters
         """
-        # Try removing least important filters one by one
-        relaxed_filters = filters.copy()
-        
-        # Remove locality first
-        if relaxed_filters.get('locality'):
-            relaxed_filters['locality'] = None
-            results = self.search(relaxed_filters)
-            if not results.empty:
-                return results, 'locality'
-        
-        # Remove status
-        if relaxed_filters.get('status'):
-            relaxed_filters['status'] = None
-            results = self.search(relaxed_filters)
-            if not results.empty:
-                return results, 'status'
-        
-        # Increase budget by 20%
-        if relaxed_filters.get('budget_max'):
-            relaxed_filters['budget_max'] *= 1.2
-            results = self.search(relaxed_filters)
-            if not results.empty:
-                return results, 'budget'
-        
-        # Remove BHK constraint
-        if relaxed_filters.get('bhk'):
-            relaxed_filters['bhk'] = None
-            results = self.search(relaxed_filters)
-            if not results.empty:
-                return results, 'bhk'
-        
-        return pd.DataFrame(), None
\ No newline at end of file
+        index = self.index
+        key = (index.version, 'expand', self.cache_key(filters))
+        with self.metrics.span('stage_seconds', stage='expand_search'):
+            results, relaxed = self._cached(key, lambda: self._expand_search(index, filters))
+        self.metrics.observe('stage_rows', len(results), stage='expand_search')
+        return results, relaxed
+    
+    def _expand_search(self, index, filters):
+        """
+        Uncached implementation of expand_search()
+        
+        Each filter's positions are computed once; every relaxation level
+        just re-intersects the parts that are still active.
+        """
+        parts = self._filter_positions(index, filters)
+        budget_max = filters.get('budget_max')
+        
+        # Least important filters are relaxed first, cumulatively
+        relaxations = [
+            name for name in ('locality', 'status', 'budget', 'bhk')
+            if filters.get('budget_max' if name == 'budget' else name)
+        ]
+        
+        for relaxed in relaxations:
+            if relaxed == 'budget':
+                # Increase budget by 20%
+                budget_max *= 1.2
+            else:
+                parts.pop(relaxed, None)
+            
+            top_positions = self._first_unique(index, self._combine(index, parts, budget_max), 10)
+            if top_positions:
+                logger.debug("Expanded search by relaxing %s: %d properties", relaxed, len(top_positions))
+                return index.result_frame.iloc[top_positions], relaxed
+        
+        return pd.DataFrame(), None
@@ -0,0 +1,166 @@
+import logging
+import math
+
+import numpy as np
+
+from .data_loader import DataLoader
+from .metrics import DISABLED
+from .query_parser import QueryParser
+from .search_engine import FILTER_ORDER, SearchEngine
+from .summarizer import Summarizer
+
+logger = logging.getLogger(__name__)
+
+# Filters a request may set directly, and how their values are read
+FILTER_TYPES = {
+    'city': str,
+    'bhk': int,
+    'budget_max': float,
+    'status': str,
+    'locality': str,
+    'project_name': str,
+}
+
+# Most results a single request may ask for
+MAX_RESULTS = 100
+
+
+class SearchService:
+    """
+    The query pipeline of the Streamlit app as plain functions of a request
+
+    One service holds the parser, engine and summarizer for a loaded
+    catalogue and is shared by every request; each method is synchronous
+    and thread-safe, and returns JSON-ready data.
+    """
+
+    def __init__(self, parser, engine, summarizer, metrics=None):
+        self.parser = parser
+        self.engine = engine
+        self.summarizer = summarizer
+        self.metrics = metrics or DISABLED
+
+    @classmethod
+    def from_data(cls, data_dir='data', metrics=None, **loader_options):
+        """Load the catalogue once and build the pipeline around it"""
+        df = DataLoader(data_dir=data_dir, **loader_options).get_data()
+        parser = QueryParser()
+        metrics = metrics or DISABLED
+        metrics.track_cache('parse', parser.cache)
+        return cls(parser, SearchEngine(df, metrics=metrics), Summarizer(), metrics)
+
+    @classmethod
+    def from_index(cls, index, metrics=None):
+        """Pipeline over an already built SearchIndex, e.g. attached from a SharedCatalogue"""
+        parser = QueryParser()
+        metrics = metrics or DISABLED
+        metrics.track_cache('parse', parser.cache)
+        engine = SearchEngine(index.result_frame, metrics=metrics, index=index)
+        return cls(parser, engine, Summarizer(), metrics)
+
+    def filters(self, query=None, overrides=None):
+        """
+        Filters parsed from a query, with explicitly given filters on top
+
+        Raises:
+            ValueError: An unknown filter or a value of the wrong type
+        """
+        if query:
+            with self.metrics.span('stage_seconds', stage='parse'):
+                filters = self.parser.parse(query)
+        else:
+            filters = {name: None for name in FILTER_ORDER}
+        for name, value in (overrides or {}).items():
+            if name not in FILTER_TYPES:
+                raise ValueError(f"unknown filter: {name}")
+            if value is None or value == '':
+                filters[name] = None
+                continue
+            try:
+                value = FILTER_TYPES[name](value)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"invalid {name}: {value!r}") from None
+            # float() accepts 'nan' and 'inf', which would switch the filter off
+            if isinstance(value, float) and not math.isfinite(value):
+                raise ValueError(f"invalid {name}: {value!r}")
+            filters[name] = value
+        return filters
+
+    def search(self, query=None, overrides=None, top_n=10):
+        """
+        Everything the chat answer shows: summary, statistics and cards
+
+        Falls back to expand_search() when nothing matches, as the app does.
+        """
+        filters = self.filters(query, overrides)
+        top_n = self._limit(top_n)
+        results = self.engine.search(filters, top_n=top_n)
+        relaxed = None
+        if results.empty:
+            results, relaxed = self.engine.expand_search(filters)
+            results = results.head(top_n)
+        stats = self.engine.get_statistics(results, filters)
+        with self.metrics.span('stage_seconds', stage='generate_summary'):
+            summary = self.summarizer.generate_summary(results, filters, stats, relaxed)
+        return {
+            'query': query,
+            'filters': filters,
+            'relaxed': relaxed,
+            'summary': summary,
+            'stats': stats,
+            'results': self._cards(results),
+        }
+
+    def stats(self, query=None, overrides=None, facets=None):
+        """Facet counts over every listing matching the filters"""
+        filters = self.filters(query, overrides)
+        return {
+            'query': query,
+            'filters': filters,
+            'facets': self.engine.facet_counts(filters, facets),
+        }
+
+    def expand(self, query=None, overrides=None, top_n=10):
+        """Results of expand_search(), whether or not the filters match directly"""
+        filters = self.filters(query, overrides)
+        results, relaxed = self.engine.expand_search(filters)
+        return {
+            'query': query,
+            'filters': filters,
+            'relaxed': relaxed,
+            'results': self._cards(results.head(self._limit(top_n))),
+        }
+
+    def health(self):
+        index = self.engine.index
+        return {'status': 'ok', 'rows': len(index.row_labels), 'version': index.version}
+
+    def _cards(self, results):
+        with self.metrics.span('stage_seconds', stage='format_cards'):
+            return self.summarizer.format_property_cards(results)
+
+    @staticmethod
+    def _limit(top_n):
+        try:
+            top_n = int(top_n)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"invalid top_n: {top_n!r}") from None
+        if not 1 <= top_n <= MAX_RESULTS:
+            raise ValueError(f"top_n must be between 1 and {MAX_RESULTS}")
+        return top_n
+
+
+def json_ready(value):
+    """
+    Plain JSON types for a response: NumPy scalars unwrapped, NaN as null,
+    dictionary keys as strings
+    """
+    if isinstance(value, dict):
+        return {str(json_ready(key)): json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_ready(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
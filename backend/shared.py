@@ -0,0 +1,153 @@
+import io
+import logging
+import mmap
+import os
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# RAM-backed by default, so publishing never touches a disk
+SHARED_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+# Every array starts on a cache-line boundary of the data file
+ALIGNMENT = 64
+
+
+class SharedCatalogue:
+    """
+    A SearchIndex published once for any number of processes to attach
+
+    publish() pickles the index with every numeric NumPy array (result
+    columns, categorical codes, index positions and offsets, facet slots,
+    cube cells) written into one data file instead of the pickle. attach()
+    memory-maps that file read-only and unpickles the small remainder with
+    those arrays as views into the mapping, so each worker shares the same
+    physical pages: nothing is parsed or copied, and attaching takes
+    milliseconds whatever the catalogue size. Text vocabularies (category
+    names, trigram strings) are ordinary objects in the pickle, loaded by
+    each process.
+    """
+
+    DATA = 'arrays.bin'
+    OBJECTS = 'index.pickle'
+
+    def __init__(self, directory, index, owner=False):
+        self.directory = directory
+        self.index = index
+        self.owner = owner
+
+    @classmethod
+    def publish(cls, index, directory=None):
+        """
+        Write an index for other processes to attach
+
+        Args:
+            index (SearchIndex): Bundle to share, e.g. SearchEngine.index
+            directory (str): Where to write, a fresh directory under SHARED_ROOT by default
+
+        Returns:
+            SharedCatalogue: the publication; close() removes it
+        """
+        start = time.perf_counter()
+        directory = directory or tempfile.mkdtemp(prefix='property-catalogue-', dir=SHARED_ROOT)
+        tmp_dir = f"{directory}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        with open(os.path.join(tmp_dir, cls.DATA), 'wb') as data:
+            objects = io.BytesIO()
+            _Publisher(objects, data).dump(index)
+        with open(os.path.join(tmp_dir, cls.OBJECTS), 'wb') as f:
+            f.write(objects.getvalue())
+
+        # Swap the finished publication in, as SnapshotStore does
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+        logger.info("Published catalogue (%d rows, %.1f MB shared) to %s in %.2fs",
+                    len(index.row_labels), os.path.getsize(os.path.join(directory, cls.DATA)) / 1e6,
+                    directory, time.perf_counter() - start)
+        return cls(directory, index, owner=True)
+
+    @classmethod
+    def attach(cls, directory):
+        """
+        Map a published index into this process
+
+        Returns:
+            SharedCatalogue: with .index backed by the shared pages
+        """
+        start = time.perf_counter()
+        with open(os.path.join(directory, cls.DATA), 'rb') as data:
+            size = os.fstat(data.fileno()).st_size
+            # mmap refuses empty files; an index without arrays needs no mapping
+            mapping = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        with open(os.path.join(directory, cls.OBJECTS), 'rb') as f:
+            index = _Attacher(f, mapping).load()
+        logger.info("Attached catalogue (%d rows) from %s in %.1f ms",
+                    len(index.row_labels), directory, (time.perf_counter() - start) * 1000)
+        return cls(directory, index)
+
+    def close(self):
+        """Remove the publication (owner only); attached mappings stay valid"""
+        if self.owner:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.owner = False
+
+
+class _Publisher(pickle.Pickler):
+    """Pickler that writes NumPy arrays to a side file and refers to them by offset"""
+
+    def __init__(self, file, data):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.data = data
+        self.written = {}
+        # Arrays made while pickling (e.g. by pandas' __reduce__) are kept
+        # alive, so an id() is never reused for a different array
+        self.arrays = []
+
+    def persistent_id(self, obj):
+        # np.memmap columns of a snapshot are stored like any other array
+        if type(obj) not in (np.ndarray, np.memmap) or obj.dtype.hasobject:
+            return None
+        reference = self.written.get(id(obj))
+        if reference is None:
+            self.arrays.append(obj)
+            reference = self.written[id(obj)] = self._write(obj)
+        return reference
+
+    def _write(self, array):
+        """Append one array to the data file; returns how to find it again"""
+        if array.flags.c_contiguous:
+            raw, order = array, 'C'
+        elif array.flags.f_contiguous:
+            # Stored transposed, so the attached array keeps its memory layout
+            raw, order = array.T, 'F'
+        else:
+            raw, order = np.ascontiguousarray(array), 'C'
+
+        offset = self.data.tell()
+        padding = -offset % ALIGNMENT
+        self.data.write(b'\0' * padding)
+        raw.tofile(self.data)
+        return ('ndarray', offset + padding, raw.dtype.str, raw.shape, order)
+
+
+class _Attacher(pickle.Unpickler):
+    """Unpickler resolving array references to read-only views of the mapping"""
+
+    def __init__(self, file, mapping):
+        super().__init__(file)
+        self.mapping = mapping
+
+    def persistent_load(self, reference):
+        _, offset, dtype, shape, order = reference
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(self.mapping, dtype=dtype, count=count, offset=offset if count else 0)
+        array = array.reshape(shape)
+        return array.T if order == 'F' else array
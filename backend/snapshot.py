@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .details import DetailStore
+
+# Bump whenever the cleaned frame layout changes so old snapshots get rebuilt
+SNAPSHOT_VERSION = 7
+
+
+class SnapshotStore:
+    """Persist the merged dataframe as a memory-mappable NumPy column bundle"""
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+
+    def fingerprint(self, paths):
+        """
+        Describe the source files so a stale snapshot can be detected
+
+        Returns:
+            dict: {file name: {'size', 'mtime_ns', 'sha256'}}
+        """
+        fingerprint = {}
+        for path in paths:
+            stat = os.stat(path)
+            fingerprint[os.path.basename(path)] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': self._hash_file(path),
+            }
+        return fingerprint
+
+    def is_fresh(self, paths, layout=None):
+        """Check whether the stored snapshot was built from these exact files"""
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get('version') != SNAPSHOT_VERSION:
+            return False
+        if manifest.get('layout') != layout:
+            return False
+
+        stored = manifest.get('sources', {})
+        if sorted(stored) != sorted(os.path.basename(p) for p in paths):
+            return False
+
+        # Size and mtime decide without reading the files; only a file whose
+        # mtime moved is hashed, so a touched but unchanged file still matches
+        touched = []
+        for path in paths:
+            stat = os.stat(path)
+            source = stored[os.path.basename(path)]
+            if stat.st_size != source['size']:
+                return False
+            if stat.st_mtime_ns != source['mtime_ns']:
+                touched.append((path, source, stat.st_mtime_ns))
+        if not touched:
+            return True
+        if any(self._hash_file(path) != source['sha256'] for path, source, _ in touched):
+            return False
+
+        # Remember the new mtimes so the next start skips the hashing again
+        for _, source, mtime_ns in touched:
+            source['mtime_ns'] = mtime_ns
+        self._write_manifest(manifest)
+        return True
+
+    def load(self):
+        """
+        Rebuild the dataframe from the snapshot, memory-mapping numeric columns
+
+        Returns:
+            pd.DataFrame or None if no usable snapshot exists
+        """
+        manifest = self._read_manifest()
+        if manifest is None:
+            return None
+
+        columns = {}
+        for spec in manifest['columns']:
+            columns[spec['name']] = self._read_column(spec)
+
+        df = pd.DataFrame(columns, copy=False)
+        # Set the labels afterwards: passing index= would align the columns'
+        # default positions against them once rows had been dropped
+        df.index = pd.Index(self._load_array(manifest['index']), name=None)
+        return df[[spec['name'] for spec in manifest['columns']]]
+
+    def metadata(self):
+        """Extra values saved with the snapshot, e.g. the refresh watermark"""
+        manifest = self._read_manifest()
+        return manifest.get('meta', {}) if manifest else {}
+
+    def details(self):
+        """Lazy reader for the detail side store saved with the snapshot"""
+        return DetailStore.open(self._path('details'))
+
+    def save(self, df, fingerprint, layout=None, details=None, meta=None):
+        """
+        Write the dataframe (and optional detail fields) to a temporary bundle, then swap it in
+
+        details may be a frame of detail columns or a DetailStore already
+        written to disk, whose directory is moved into the bundle. meta is
+        a small JSON-able dict stored in the manifest, see metadata().
+        """
+        tmp_dir = f"{self.snapshot_dir}.tmp-{os.getpid()}"
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        specs = []
+        for position, name in enumerate(df.columns):
+            specs.append(self._write_column(tmp_dir, f"c{position}", name, df[name]))
+
+        index_file = 'index.npy'
+        np.save(os.path.join(tmp_dir, index_file), np.asarray(df.index))
+
+        if isinstance(details, DetailStore):
+            # Already laid out on disk (streaming ingestion), just adopt it
+            shutil.move(details.directory, os.path.join(tmp_dir, 'details'))
+        elif details is not None:
+            DetailStore.write(os.path.join(tmp_dir, 'details'), details)
+
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'layout': layout,
+            'rows': len(df),
+            'sources': fingerprint,
+            'index': index_file,
+            'columns': specs,
+            'meta': meta or {},
+        }
+        with open(os.path.join(tmp_dir, self.MANIFEST), 'w') as f:
+            json.dump(manifest, f)
+
+        old_dir = f"{self.snapshot_dir}.old-{os.getpid()}"
+        if os.path.exists(self.snapshot_dir):
+            os.replace(self.snapshot_dir, old_dir)
+        os.replace(tmp_dir, self.snapshot_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _write_column(self, directory, stem, name, series):
+        """Store one column and return its manifest entry"""
+        spec = {'name': name, 'dtype': str(series.dtype)}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            spec['kind'] = 'category'
+            spec['ordered'] = bool(series.cat.ordered)
+            spec['codes'] = self._save(directory, f"{stem}.codes", series.cat.codes.to_numpy())
+            categories = pd.Series(series.cat.categories.astype(str), dtype=object)
+            spec['categories'] = self._write_strings(directory, f"{stem}.cats", categories)
+        elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_numeric_dtype(series.dtype):
+            # Nullable integers/floats: raw values plus the NA mask
+            spec['kind'] = 'masked'
+            values = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+            spec['data'] = self._save(directory, stem, values)
+            spec['mask'] = self._save(directory, f"{stem}.mask", series.isna().to_numpy())
+        elif pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+            spec['kind'] = 'numeric'
+            spec['data'] = self._save(directory, stem, series.to_numpy())
+        elif series.map(lambda v: isinstance(v, str) or pd.isna(v)).all():
+            spec['kind'] = 'string'
+            spec.update(self._write_strings(directory, stem, series))
+        else:
+            # Mixed python objects cannot be laid out as text, fall back to pickle
+            spec['kind'] = 'object'
+            spec['data'] = self._save(directory, stem, series.to_numpy(dtype=object))
+        return spec
+
+    def _write_strings(self, directory, stem, series):
+        """Lay out a text column as one UTF-8 blob plus character offsets"""
+        missing = series.isna().to_numpy()
+        values = series.astype(object).where(~missing, '').tolist()
+        lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        blob = np.frombuffer(''.join(values).encode('utf-8'), dtype=np.uint8)
+        return {
+            'blob': self._save(directory, f"{stem}.blob", blob),
+            'offsets': self._save(directory, f"{stem}.offsets", offsets),
+            'missing': self._save(directory, f"{stem}.missing", missing),
+        }
+
+    def _read_column(self, spec):
+        """Inverse of _write_column"""
+        if spec['kind'] == 'numeric':
+            return pd.Series(self._load_array(spec['data']), dtype=spec['dtype'], copy=False)
+        if spec['kind'] == 'masked':
+            values = pd.array(self._load_array(spec['data']), dtype=spec['dtype'])
+            values[self._load_array(spec['mask'])] = pd.NA
+            return pd.Series(values)
+        if spec['kind'] == 'category':
+            categories = self._read_strings(spec['categories'])
+            codes = np.asarray(self._load_array(spec['codes']))
+            return pd.Series(pd.Categorical.from_codes(codes, categories, ordered=spec['ordered']))
+        if spec['kind'] == 'string':
+            return pd.Series(self._read_strings(spec), dtype=spec['dtype'])
+        return pd.Series(np.load(self._path(spec['data']), allow_pickle=True), dtype=spec['dtype'])
+
+    def _read_strings(self, spec):
+        blob = self._load_array(spec['blob'])
+        offsets = self._load_array(spec['offsets']).tolist()
+        missing = self._load_array(spec['missing'])
+        text = blob.tobytes().decode('utf-8')
+        values = np.empty(len(offsets) - 1, dtype=object)
+        values[:] = [text[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+        values[missing] = None
+        return values
+
+    def _save(self, directory, stem, array):
+        file_name = f"{stem}.npy"
+        np.save(os.path.join(directory, file_name), array, allow_pickle=array.dtype == object)
+        return file_name
+
+    def _load_array(self, file_name):
+        # Plain ndarray view over the read-only mapping, no copy
+        return np.load(self._path(file_name), mmap_mode='r').view(np.ndarray)
+
+    def _path(self, file_name):
+        return os.path.join(self.snapshot_dir, file_name)
+
+    def _read_manifest(self):
+        try:
+            with open(self._path(self.MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest):
+        """Replace the manifest of an existing snapshot; failing only costs a rehash"""
+        tmp_path = self._path(f"{self.MANIFEST}.tmp-{os.getpid()}")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self._path(self.MANIFEST))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _hash_file(path, block_size=1 << 20):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+# Facets counted by FacetStats, in the order they are reported
+FACETS = ['locality', 'status', 'bhk', 'furnishing', 'price_band']
+
+# Price histogram buckets in crores: (upper bound, label), the last one open-ended
+PRICE_BANDS = [
+    (0.5, 'Under 0.5 Cr'),
+    (1.0, '0.5-1 Cr'),
+    (1.5, '1-1.5 Cr'),
+    (2.0, '1.5-2 Cr'),
+    (3.0, '2-3 Cr'),
+    (5.0, '3-5 Cr'),
+    (np.inf, '5 Cr+'),
+]
+
+PRICE_BAND_LABELS = [label for _, label in PRICE_BANDS]
+
+
+def price_band_codes(prices):
+    """Index into PRICE_BANDS per price, -1 for missing prices"""
+    prices = np.asarray(prices, dtype=np.float64)
+    upper = np.array([bound for bound, _ in PRICE_BANDS[:-1]])
+    codes = np.searchsorted(upper, prices, side='right')
+    codes[np.isnan(prices)] = -1
+    return codes
+
+
+def plain(value):
+    """NumPy scalars as the Python values pandas' tolist() would give"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class FacetStats:
+    """
+    Facet counts and price aggregates over integer-coded columns
+
+    Every facet is a code per row plus the distinct values the codes refer
+    to. The codes are offset into one shared numbering and stacked, so the
+    counts of all facets for any set of rows come out of a single
+    np.bincount; price aggregates are plain reductions over the same rows.
+    """
+
+    def __init__(self, prices, facets):
+        """
+        Args:
+            prices (np.ndarray): price in crores per row
+            facets (dict): {name: (codes per row, -1 for missing; distinct values)}
+        """
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.names = list(facets)
+        self.values = [[plain(v) for v in values] for _, values in facets.values()]
+
+        # Facet i owns slots offsets[i]..offsets[i + 1]; its last slot counts missing values
+        sizes = [len(values) + 1 for values in self.values]
+        self.offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.offsets[1:])
+        self.slots = np.empty((len(self.names), len(self.prices)), dtype=np.int32)
+        for i, (codes, values) in enumerate(facets.values()):
+            codes = np.asarray(codes, dtype=np.int64)
+            self.slots[i] = np.where(codes < 0, len(values), codes) + self.offsets[i]
+
+    @classmethod
+    def from_frame(cls, frame, names=FACETS):
+        """Facets of a result frame, for rows that are not part of an index"""
+        prices = frame['price_cr'].to_numpy(dtype=np.float64)
+        facets = {}
+        for name in names:
+            if name == 'price_band':
+                facets[name] = (price_band_codes(prices), PRICE_BAND_LABELS)
+            elif name in frame.columns:
+                codes, uniques = pd.factorize(frame[name])
+                facets[name] = (codes, list(uniques))
+        return cls(prices, facets)
+
+    def counts(self, positions=None, names=None):
+        """
+        Row count, price aggregates and per-value counts of each facet
+
+        Args:
+            positions (np.ndarray): rows to aggregate, None for every row
+            names (list): facets to report, all of them by default
+
+        Returns:
+            dict: {'count', 'avg_price', 'min_price', 'max_price',
+                   facet name: {value: rows}} with values by descending count
+                   (price bands in band order)
+        """
+        slots = self.slots if positions is None else self.slots[:, positions]
+        totals = np.bincount(slots.ravel(), minlength=self.offsets[-1])
+        result = self._prices(positions)
+        for i, name in enumerate(self.names):
+            if names is not None and name not in names:
+                continue
+            facet = totals[self.offsets[i]:self.offsets[i + 1] - 1]
+            present = np.flatnonzero(facet)
+            if name != 'price_band':
+                present = present[np.argsort(-facet[present], kind='stable')]
+            result[name] = {self.values[i][code]: int(facet[code]) for code in present.tolist()}
+        return result
+
+    def summary(self, positions=None):
+        """
+        The get_statistics() view of a set of rows
+
+        Localities and statuses are listed in the order the rows first
+        mention them, BHK types sorted.
+        """
+        count = len(self.prices) if positions is None else len(positions)
+        if count == 0:
+            return {
+                'count': 0,
+                'avg_price': 0,
+                'min_price': 0,
+                'max_price': 0,
+                'localities': [],
+                'statuses': [],
+                'bhk_types': []
+            }
+
+        stats = {'count': count}
+        stats.update(self._prices(positions))
+        stats['localities'] = self._seen('locality', positions)
+        stats['statuses'] = self._seen('status', positions, keep_missing=True)
+        stats['bhk_types'] = sorted(self._seen('bhk', positions))
+        return stats
+
+    def _prices(self, positions):
+        prices = self.prices if positions is None else self.prices[positions]
+        if len(prices) == 0 or np.isnan(prices).all():
+            return {'count': len(prices), 'avg_price': 0, 'min_price': 0, 'max_price': 0}
+        return {
+            'count': len(prices),
+            'avg_price': float(np.nanmean(prices)),
+            'min_price': float(np.nanmin(prices)),
+            'max_price': float(np.nanmax(prices)),
+        }
+
+    def _seen(self, name, positions, keep_missing=False):
+        """Distinct values of a facet in order of first appearance"""
+        if name not in self.names:
+            return []
+        i = self.names.index(name)
+        slots = self.slots[i] if positions is None else self.slots[i, positions]
+        distinct, first = np.unique(slots, return_index=True)
+        missing = self.offsets[i + 1] - 1
+        values = []
+        for slot in distinct[np.argsort(first, kind='stable')].tolist():
+            if slot != missing:
+                values.append(self.values[i][slot - self.offsets[i]])
+            elif keep_missing:
+                values.append(np.nan)
+        return values
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 class Summarizer:
@@ -130,43 +131,85 @@ class Summarizer:
         Returns:
             dict: Property card data
         """
-        # Format price
-        price_cr = row['price_cr']
-        if price_cr >= 1:
-            price_str = f"₹{price_cr:.2f} Cr"
-        else:
-            price_lakh = price_cr * 100
-            price_str = f"₹{price_lakh:.2f} L"
+        return self.format_property_cards(pd.DataFrame([row]))[0]
+    
+    def format_property_cards(self, df):
+        """
+        Format every row of a results frame as a card dictionary
         
-        # Extract BHK type
-        bhk_str = row.get('type', 'N/A')
-        if pd.isna(bhk_str):
-            bhk_str = f"{int(row['bhk'])}BHK" if not pd.isna(row['bhk']) else 'N/A'
+        Each field is computed for the whole column at once (text lookups
+        once per distinct value), so large result pages and exports do not
+        build a Series per row.
+        
+        Args:
+            df (pd.DataFrame): Search results
+            
+        Returns:
+            list: Property card dicts, in row order
+        """
+        if df.empty:
+            return []
+        column = lambda name, default: df[name] if name in df.columns else pd.Series(default, index=df.index, dtype=object)
+        
+        # Format price in crores, or lakhs below one crore
+        price_cr = df['price_cr'].to_numpy(dtype=np.float64)
+        crores = price_cr >= 1
+        amounts = np.char.mod('%.2f', np.where(crores, price_cr, price_cr * 100))
+        prices = np.char.add(np.char.add('₹', amounts), np.where(crores, ' Cr', ' L'))
+        
+        # Configuration type, else the BHK count
+        types = column('type', 'N/A')
+        if types.isna().any():
+            bhk = self._numbers(df['bhk'])
+            bhk_labels = np.where(np.isnan(bhk), 'N/A', np.char.add(self._whole(bhk), 'BHK'))
+            bhk_strs = np.where(types.isna().to_numpy(), bhk_labels, types.to_numpy(dtype=object))
+        else:
+            bhk_strs = types.to_numpy(dtype=object)
         
         # Get locality from address
-        locality = "Mumbai" if "Mumbai" in str(row.get('fullAddress', '')) else "Pune"
+        in_mumbai = self._per_value(column('fullAddress', ''), lambda address: "Mumbai" in str(address), False).astype(bool)
+        locations = np.where(in_mumbai, "Mumbai", "Pune")
         
         # Extract amenities from available fields
-        amenities = []
-        if row.get('furnishing') and row['furnishing'] != 'Unfurnished':
-            amenities.append(row['furnishing'])
-        if not pd.isna(row.get('carpetArea')):
-            amenities.append(f"{int(row['carpetArea'])} sq.ft")
-        if not pd.isna(row.get('balcony')) and int(row.get('balcony', 0)) > 0:
-            amenities.append(f"{int(row['balcony'])} Balcony")
+        furnishing = column('furnishing', None)
+        furnished = self._per_value(furnishing, lambda value: bool(value) and value != 'Unfurnished', False).astype(bool)
+        area = self._numbers(column('carpetArea', np.nan))
+        balcony = np.trunc(self._numbers(column('balcony', np.nan)))
+        amenity_columns = [
+            np.where(furnished, furnishing.to_numpy(dtype=object), None),
+            np.where(np.isnan(area), None, np.char.add(self._whole(area), ' sq.ft')),
+            np.where(balcony > 0, np.char.add(self._whole(balcony), ' Balcony'), None),
+        ]
+        amenities = [[a for a in row if a is not None] for row in zip(*(c.tolist() for c in amenity_columns))]
         
         # Build slug URL
-        slug = row.get('slug', '')
-        url = f"/project/{slug}" if slug else "#"
-        
-        return {
-            'title': row.get('projectName', 'Unknown Project'),
-            'location': f"{locality}",
-            'bhk': bhk_str,
-            'price': price_str,
-            'status': row.get('status', 'N/A'),
-            'amenities': amenities[:3],  # Top 3
-            'carpet_area': row.get('carpetArea', 'N/A'),
-            'url': url,
-            'project_category': row.get('projectCategory', 'Residential')
-        }
\ No newline at end of file
+        urls = self._per_value(column('slug', ''), lambda slug: f"/project/{slug}" if slug else "#", "#")
+        
+        fields = {
+            'title': column('projectName', 'Unknown Project').tolist(),
+            'location': locations.tolist(),
+            'bhk': bhk_strs.tolist(),
+            'price': prices.tolist(),
+            'status': column('status', 'N/A').tolist(),
+            'amenities': amenities,  # Top 3
+            'carpet_area': column('carpetArea', 'N/A').tolist(),
+            'url': urls.tolist(),
+            'project_category': column('projectCategory', 'Residential').tolist(),
+        }
+        return [dict(zip(fields, values)) for values in zip(*fields.values())]
+    
+    @staticmethod
+    def _per_value(series, function, missing):
+        """Apply function once per distinct value and spread the results over the rows"""
+        codes, uniques = pd.factorize(series)
+        results = np.array([function(value) for value in uniques] + [missing], dtype=object)
+        return results[codes]
+    
+    @staticmethod
+    def _numbers(series):
+        return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    @staticmethod
+    def _whole(values):
+        """Numbers truncated to integers, as text (missing values come out as '0')"""
+        return np.where(np.isnan(values), 0, np.trunc(values)).astype(np.int64).astype(str)
@@ -0,0 +1,37 @@
+"""
+Benchmark: in-memory size of the catalogue with and without compaction
+Run: python benchmarks/bench_catalogue_memory.py [data_dir]
+
+Reports DataFrame.memory_usage(deep=True) scaled to 100k rows.
+"""
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from backend.data_loader import DataLoader
+
+
+def per_100k_rows(df):
+    """MiB per 100k rows"""
+    return df.memory_usage(index=True, deep=True).sum() / len(df) * 100_000 / 2**20
+
+
+def main():
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'data')
+    
+    full = DataLoader(data_dir, use_snapshot=False, compact=False).load_and_merge()
+    compact = DataLoader(data_dir, use_snapshot=False, compact=True).load_and_merge()
+    
+    before = per_100k_rows(full)
+    after = per_100k_rows(compact)
+    print(f"\nRows: {len(full)}")
+    print(f"Full frame:    {len(full.columns):>3} columns, {before:8.1f} MiB per 100k rows")
+    print(f"Compact frame: {len(compact.columns):>3} columns, {after:8.1f} MiB per 100k rows")
+    print(f"Reduction:     {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: vectorized city extraction vs the old per-row apply
+Run: python benchmarks/bench_city_extraction.py [rows ...]
+
+Defaults to 10k, 100k and 1M rows.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from backend.data_loader import DataLoader
+
+
+def legacy_extract_city(address):
+    """The original Series.apply implementation, kept for comparison"""
+    if pd.isna(address):
+        return None
+    address_lower = str(address).lower()
+    
+    if 'mumbai' in address_lower:
+        return 'Mumbai'
+    elif 'pune' in address_lower:
+        return 'Pune'
+    elif 'delhi' in address_lower:
+        return 'Delhi'
+    elif 'bangalore' in address_lower or 'bengaluru' in address_lower:
+        return 'Bangalore'
+    
+    pune_areas = ['pimpri', 'chinchwad', 'wakad', 'baner', 'kharadi', 
+                 'hinjewadi', 'ravet', 'mundhwa', 'hadapsar', 'viman nagar',
+                 'shivajinagar', 'camp', 'kothrud', 'aundh', 'mamurdi']
+    if any(area in address_lower for area in pune_areas):
+        return 'Pune'
+    
+    mumbai_areas = ['chembur', 'andheri', 'bandra', 'goregaon', 'borivali',
+                  'mulund', 'thane', 'powai', 'ghatkopar', 'kurla', 'dadar',
+                  'worli', 'colaba', 'marine drive', 'lower parel']
+    if any(area in address_lower for area in mumbai_areas):
+        return 'Mumbai'
+    
+    return None
+
+
+def legacy_path(address, landmark):
+    city = address.apply(legacy_extract_city)
+    mask = city.isna()
+    city.loc[mask] = landmark.loc[mask].apply(legacy_extract_city)
+    return city
+
+
+def sample_addresses(rows, variants_per_address=20, data_dir=os.path.join(ROOT, 'data'), seed=42):
+    """
+    Build address/landmark columns shaped like a merged export
+    
+    Every project address is shared by all of its variants, so a pool of
+    rows // variants_per_address distinct addresses is derived from the real
+    ones (prefixed with a plot number) and resampled up to `rows`.
+    """
+    addresses = pd.read_csv(os.path.join(data_dir, 'ProjectAddress.csv'))
+    rng = np.random.default_rng(seed)
+    
+    pool_size = max(1, rows // variants_per_address)
+    base = addresses.iloc[rng.integers(0, len(addresses), pool_size)].reset_index(drop=True)
+    plots = pd.Series([f"plot {i}, " for i in range(pool_size)])
+    pool_address = (plots + base['fullAddress'].fillna('')).where(base['fullAddress'].notna())
+    pool_landmark = base['landmark']
+    
+    picks = rng.integers(0, pool_size, rows)
+    address = pool_address.iloc[picks].reset_index(drop=True)
+    landmark = pool_landmark.iloc[picks].reset_index(drop=True)
+    return address, landmark
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    loader = DataLoader(data_dir=os.path.join(ROOT, 'data'), use_snapshot=False)
+    
+    print(f"{'rows':>10} {'apply (s)':>10} {'vectorized (s)':>15} {'speedup':>8}")
+    for rows in sizes:
+        address, landmark = sample_addresses(rows)
+        
+        start = time.perf_counter()
+        expected = legacy_path(address, landmark)
+        legacy_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        actual = loader._extract_city(address, landmark)
+        vector_time = time.perf_counter() - start
+        
+        same = (pd.Series(actual, dtype=object).fillna('').values == expected.fillna('').values).all()
+        if not same:
+            print(f"❌ Results differ at {rows} rows")
+        print(f"{rows:>10} {legacy_time:>10.3f} {vector_time:>15.3f} {legacy_time / vector_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
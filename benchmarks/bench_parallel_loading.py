@@ -0,0 +1,50 @@
+"""
+Benchmark: parallel vs serial CSV loading and cleaning
+Run: python benchmarks/bench_parallel_loading.py [rows] [workers]
+
+Defaults to 1M synthetic variant rows and one worker per CPU. The data is
+generated once under the temp dir (see synthetic.py).
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from backend.data_loader import DataLoader
+from synthetic import cached
+
+
+def timed_load(data_dir, workers):
+    """Load without snapshots, returning (frame, seconds)"""
+    loader = DataLoader(data_dir, use_snapshot=False, workers=workers)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        df = loader.load_and_merge()
+    return df, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    data_dir = cached(rows)
+    
+    serial, serial_time = timed_load(data_dir, None)
+    parallel, parallel_time = timed_load(data_dir, workers)
+    pd.testing.assert_frame_equal(serial, parallel)
+    
+    print(f"\nVariant rows: {rows}, catalogue rows: {len(serial)}, CPUs: {os.cpu_count()}")
+    print(f"{'mode':>22} {'seconds':>9}")
+    print(f"{'serial':>22} {serial_time:9.2f}")
+    print(f"{f'parallel ({workers} workers)':>22} {parallel_time:9.2f}")
+    print(f"Speedup: {serial_time / parallel_time:.2f}x (identical frames)")
+
+
+if __name__ == '__main__':
+    main()
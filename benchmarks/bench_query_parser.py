@@ -0,0 +1,84 @@
+"""
+Benchmark: QueryParser.parse throughput as the locality gazetteer grows
+Run: python benchmarks/bench_query_parser.py [gazetteer sizes ...]
+
+Defaults to 40, 500, 5k and 50k localities. The legacy column replays the
+old per-locality substring scan for comparison.
+"""
+
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from backend.query_parser import DEFAULT_LOCALITIES, QueryParser
+
+QUERY_TEMPLATES = [
+    "3BHK apartments in Mumbai under 2 Cr",
+    "Ready to move 2BHK in Pune",
+    "Apartments under 1.5 Cr",
+    "2 bhk near {locality} below 90 lakh",
+    "Show me ready to move flats in {locality}",
+    "{locality} 3 bedroom under construction",
+]
+
+
+class LinearScan:
+    """The old locality lookup: one substring check per gazetteer entry"""
+    
+    def __init__(self, localities):
+        self.localities = localities
+    
+    def find(self, tokens):
+        query_lower = ' '.join(tokens)
+        for locality in self.localities:
+            if locality in query_lower:
+                return locality
+        return None
+
+
+def build_gazetteer(size, seed=7):
+    """The real localities padded with synthetic two-word names"""
+    rng = random.Random(seed)
+    suffixes = ['nagar', 'wadi', 'gaon', 'peth', 'colony', 'park', 'road']
+    localities = list(DEFAULT_LOCALITIES)
+    while len(localities) < size:
+        stem = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+        localities.append(f"{stem} {rng.choice(suffixes)}")
+    return localities[:size]
+
+
+def build_queries(localities, count=2000, seed=11):
+    rng = random.Random(seed)
+    return [rng.choice(QUERY_TEMPLATES).format(locality=rng.choice(localities)) for _ in range(count)]
+
+
+def throughput(parser, queries):
+    start = time.perf_counter()
+    for query in queries:
+        parser.parse(query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [40, 500, 5_000, 50_000]
+    
+    print(f"{'localities':>10} {'legacy q/s':>12} {'trie q/s':>12} {'speedup':>8}")
+    for size in sizes:
+        localities = build_gazetteer(size)
+        queries = build_queries(localities)
+        
+        parser = QueryParser(localities=localities)
+        legacy = QueryParser(localities=localities)
+        legacy.locality_matcher = LinearScan(legacy.localities)
+        
+        legacy_qps = throughput(legacy, queries)
+        trie_qps = throughput(parser, queries)
+        print(f"{size:>10} {legacy_qps:>12,.0f} {trie_qps:>12,.0f} {trie_qps / legacy_qps:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""
+Benchmark suite: the whole query pipeline on a synthetic catalogue
+Run: python benchmarks/bench_suite.py [--rows N] [--only load,search] [--save [PATH]] [--compare PATH]
+
+Scenarios:
+    load    DataLoader.load_and_merge without snapshots, and building the SearchEngine
+    parse   QueryParser.parse throughput, uncached and cached
+    search  SearchEngine.search latency percentiles per query mix, uncached
+    expand  SearchEngine.expand_search latency on queries with no direct hits
+    cards   Summarizer.format_property_cards per results page and in bulk
+
+Defaults to 100k synthetic variant rows (see synthetic.py; 10k to 10M work).
+--save writes the results as a baseline, benchmarks/baselines/suite-<rows>.json
+by default. --compare checks a run against a saved baseline and exits with
+status 1 when any metric got worse by more than --tolerance. Baselines are
+only comparable on the same machine, rows and seed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(ROOT)
+
+from backend.data_loader import DataLoader
+from backend.query_parser import QueryParser
+from backend.search_engine import SearchEngine
+from backend.summarizer import Summarizer
+from synthetic import BHK_WEIGHTS, CITIES, DEVELOPERS, NAME_SUFFIXES, cached
+
+SCENARIOS = ['load', 'parse', 'search', 'expand', 'cards']
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+QUERY_TEMPLATES = [
+    "{bhk}BHK apartments in {city} under {crores} Cr",
+    "Ready to move {bhk}BHK in {city}",
+    "Apartments under {crores} Cr",
+    "{bhk} bhk near {locality} below {lakhs} lakh",
+    "Show me ready to move flats in {locality}",
+    "{locality} {bhk} bedroom under construction",
+    "{developer} {suffix} in {city}",
+]
+
+# Pages of results formatted per card timing, as the app shows them
+CARD_PAGE = 6
+
+
+class Workload:
+    """Deterministic query inputs drawn from the generator's vocabularies"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.places = [(city, locality) for city, _, _, _, _, names in CITIES for locality in names]
+
+    def text_queries(self, count):
+        queries = []
+        for _ in range(count):
+            city, locality = self.rng.choice(self.places)
+            crores = self.rng.choice([0.5, 0.8, 1, 1.5, 2, 3])
+            queries.append(self.rng.choice(QUERY_TEMPLATES).format(
+                bhk=self.rng.choice(list(BHK_WEIGHTS)), city=city, crores=crores,
+                lakhs=int(crores * 100), locality=locality, developer=self.rng.choice(DEVELOPERS),
+                suffix=self.rng.choice(NAME_SUFFIXES),
+            ))
+        return queries
+
+    def filter_mixes(self, count):
+        """{mix name: filter dicts}, each mix exercising different indexes"""
+        mixes = {}
+        mixes['city'] = [{'city': self._city()} for _ in range(count)]
+        mixes['city_bhk_budget'] = [
+            {'city': self._city(), 'bhk': self._bhk(), 'budget_max': self._budget()} for _ in range(count)
+        ]
+        mixes['locality'] = [
+            {'locality': self._locality().title(), 'bhk': self._bhk()} for _ in range(count)
+        ]
+        mixes['status_budget'] = [
+            {'status': self.rng.choice(['Ready To Move', 'Under Construction']), 'budget_max': self._budget()}
+            for _ in range(count)
+        ]
+        mixes['project_name'] = [
+            {'project_name': f"{self.rng.choice(DEVELOPERS)} {self.rng.choice(NAME_SUFFIXES)}"}
+            for _ in range(count)
+        ]
+        return mixes
+
+    def zero_hit_filters(self, count):
+        """Locality from another city, or a budget below anything listed"""
+        filters = []
+        for i in range(count):
+            if i % 2:
+                filters.append({'city': 'Mumbai', 'bhk': self._bhk(), 'budget_max': 0.01, 'status': 'Ready To Move'})
+                continue
+            city, _ = self.rng.choice(self.places)
+            locality = self.rng.choice([name for other, name in self.places if other != city])
+            filters.append({'city': city, 'locality': locality.title(), 'bhk': self._bhk()})
+        return filters
+
+    def _city(self):
+        return self.rng.choice(self.places)[0]
+
+    def _locality(self):
+        return self.rng.choice(self.places)[1]
+
+    def _bhk(self):
+        return self.rng.choice(list(BHK_WEIGHTS))
+
+    def _budget(self):
+        return self.rng.choice([0.5, 0.8, 1.0, 1.5, 2.0, 3.0])
+
+
+def latencies(function, inputs):
+    """Milliseconds per call"""
+    timings = []
+    for value in inputs:
+        start = time.perf_counter()
+        function(value)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def percentiles(prefix, timings):
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {f"{prefix}_p50_ms": p50, f"{prefix}_p95_ms": p95, f"{prefix}_p99_ms": p99}
+
+
+def throughput(function, inputs):
+    start = time.perf_counter()
+    for value in inputs:
+        function(value)
+    return len(inputs) / (time.perf_counter() - start)
+
+
+class Suite:
+    """Runs scenarios against one generated catalogue, sharing the loaded state"""
+
+    def __init__(self, rows, seed, queries):
+        self.rows = rows
+        self.seed = seed
+        self.queries = queries
+        self.data_dir = cached(rows, seed)
+        self._df = None
+        self._engine = None
+
+    @property
+    def df(self):
+        if self._df is None:
+            self._df = DataLoader(self.data_dir, use_snapshot=False).load_and_merge()
+        return self._df
+
+    @property
+    def engine(self):
+        # No result cache: every query is evaluated
+        if self._engine is None:
+            self._engine = SearchEngine(self.df, cache_entries=0)
+        return self._engine
+
+    def run(self, scenarios):
+        results = {}
+        for name in scenarios:
+            start = time.perf_counter()
+            results[name] = {key: float(value) for key, value in getattr(self, f"bench_{name}")().items()}
+            print(f"  {name} done in {time.perf_counter() - start:.1f}s")
+        return results
+
+    def bench_load(self):
+        start = time.perf_counter()
+        self._df = DataLoader(self.data_dir, use_snapshot=False).load_and_merge()
+        loaded = time.perf_counter()
+        self._engine = SearchEngine(self._df, cache_entries=0)
+        return {
+            'load_and_merge_seconds': loaded - start,
+            'index_build_seconds': time.perf_counter() - loaded,
+        }
+
+    def bench_parse(self):
+        queries = Workload(self.seed).text_queries(self.queries * 10)
+        cached_parser = QueryParser()
+        for query in queries:
+            cached_parser.parse(query)
+        return {
+            'uncached_per_sec': throughput(QueryParser(cache_entries=0).parse, queries),
+            'cached_per_sec': throughput(cached_parser.parse, queries),
+        }
+
+    def bench_search(self):
+        engine = self.engine
+        metrics = {}
+        for mix, filters in Workload(self.seed).filter_mixes(self.queries).items():
+            metrics.update(percentiles(mix, latencies(engine.search, filters)))
+        parser = QueryParser()
+        parsed = [parser.parse(query) for query in Workload(self.seed).text_queries(self.queries)]
+        metrics.update(percentiles('parsed', latencies(engine.search, parsed)))
+        return metrics
+
+    def bench_expand(self):
+        engine = self.engine
+        filters = Workload(self.seed).zero_hit_filters(self.queries)
+        misses = [f for f in filters if engine.search(f).empty]
+        if not misses:
+            return {}
+        return percentiles('zero_hit', latencies(engine.expand_search, misses))
+
+    def bench_cards(self):
+        summarizer = Summarizer()
+        frame = self.engine.index.result_frame
+        rng = np.random.default_rng(self.seed)
+        starts = rng.integers(0, max(len(frame) - CARD_PAGE, 1), self.queries)
+        pages = [frame.iloc[start:start + CARD_PAGE] for start in starts]
+        bulk = frame.iloc[:10_000]
+        start = time.perf_counter()
+        summarizer.format_property_cards(bulk)
+        bulk_seconds = time.perf_counter() - start
+        metrics = percentiles('page', latencies(summarizer.format_property_cards, pages))
+        metrics['bulk_rows_per_sec'] = len(bulk) / bulk_seconds
+        return metrics
+
+
+def higher_is_better(metric):
+    return metric.endswith('_per_sec')
+
+
+def compare(baseline, current, tolerance):
+    """
+    Print every shared metric against the baseline
+
+    Returns:
+        list: (scenario, metric) pairs that regressed beyond the tolerance
+    """
+    for key in ('rows', 'seed', 'machine'):
+        if baseline['meta'].get(key) != current['meta'].get(key):
+            print(f"Warning: baseline {key} {baseline['meta'].get(key)!r} != {current['meta'].get(key)!r}")
+
+    regressions = []
+    print(f"\n{'scenario':>8} {'metric':>28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for scenario, metrics in current['results'].items():
+        for metric, value in metrics.items():
+            before = baseline['results'].get(scenario, {}).get(metric)
+            if not before:
+                continue
+            # Slowdown factor, > 1 is worse whichever way the metric points
+            slowdown = before / value if higher_is_better(metric) else value / before
+            flag = ''
+            if slowdown > 1 + tolerance:
+                flag = 'REGRESSED'
+                regressions.append((scenario, metric))
+            elif slowdown < 1 / (1 + tolerance):
+                flag = 'improved'
+            print(f"{scenario:>8} {metric:>28} {before:>12.3f} {value:>12.3f} {value / before - 1:>+7.0%} {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000, help='synthetic variant rows')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--queries', type=int, default=200, help='queries per mix')
+    parser.add_argument('--only', default=','.join(SCENARIOS), help='comma-separated scenarios')
+    parser.add_argument('--save', nargs='?', const='', default=None, help='write results as a baseline')
+    parser.add_argument('--compare', help='baseline to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown, 0.25 = 25%%')
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    suite = Suite(args.rows, args.seed, args.queries)
+    print(f"Running {', '.join(scenarios)} on {args.rows} variant rows")
+    report = {
+        'meta': {
+            'rows': args.rows,
+            'seed': args.seed,
+            'queries': args.queries,
+            'machine': platform.node(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'cpus': os.cpu_count(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': suite.run(scenarios),
+    }
+
+    print(f"\n{'scenario':>8} {'metric':>28} {'value':>12}")
+    for scenario, metrics in report['results'].items():
+        for metric, value in metrics.items():
+            print(f"{scenario:>8} {metric:>28} {value:>12.3f}")
+
+    if args.save is not None:
+        path = args.save or os.path.join(BASELINE_DIR, f"suite-{args.rows}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
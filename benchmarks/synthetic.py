@@ -0,0 +1,236 @@
+"""
+Deterministic synthetic catalogue for benchmarks
+
+Projects are spread over the gazetteer cities and localities with a
+long-tailed popularity, configurations get a realistic BHK mix, and each
+variant is priced from its city's rate per square foot, a per-locality
+premium and its carpet area. Free-text columns (images, descriptions,
+RERA ids, ...) are sampled from the bundled CSVs in data/, so every table
+keeps its real schema and text widths. Variants are written in chunks,
+which keeps memory flat up to 10M rows. The same (rows, seed) always
+produces byte-identical files.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Bumped whenever the generated data changes, so cached() regenerates
+GENERATOR_VERSION = 2
+
+# Variants per project and configurations per project, roughly as in data/
+VARIANTS_PER_PROJECT = 20
+CONFIGS_PER_PROJECT = 3
+
+# Variant rows generated and written per step
+CHUNK_ROWS = 250_000
+
+# (city, share of projects, rupees per sq ft, state, pincode prefix, localities by popularity)
+CITIES = [
+    ('Pune', 0.45, 8_500, 'Maharashtra', 411, [
+        'wakad', 'hinjewadi', 'baner', 'kharadi', 'wagholi', 'hadapsar', 'ravet',
+        'punawale', 'viman nagar', 'undri', 'pimple saudagar', 'bavdhan', 'aundh',
+        'dhanori', 'mundhwa', 'thergaon', 'chinchwad', 'pimpri', 'pashan', 'sus',
+        'koregaon park', 'shivajinagar', 'pimple nilakh', 'mamurdi', 'talegaon',
+        'dehu road', 'camp',
+    ]),
+    ('Mumbai', 0.35, 22_000, 'Maharashtra', 400, [
+        'thane', 'andheri', 'powai', 'goregaon', 'borivali', 'chembur', 'mulund',
+        'ghatkopar',
+    ]),
+    ('Bangalore', 0.15, 9_500, 'Karnataka', 560, [
+        'whitefield', 'electronic city', 'marathahalli',
+    ]),
+    # Not in the locality gazetteer, so these rows only resolve a city
+    ('Delhi', 0.05, 12_000, 'Delhi', 110, [
+        'dwarka', 'rohini', 'saket', 'vasant kunj',
+    ]),
+]
+
+# Share of addresses naming neither city nor locality (exercises the fallbacks)
+UNPLACED_SHARE = 0.03
+
+BHK_WEIGHTS = {1: 0.22, 2: 0.40, 3: 0.27, 4: 0.08, 5: 0.03}
+# Median carpet area in sq ft per BHK count
+CARPET_AREA = {1: 420, 2: 680, 3: 1_020, 4: 1_450, 5: 2_000}
+# Share of configurations whose type is blank, leaving BHK to the bathrooms fallback
+UNTYPED_SHARE = 0.01
+
+STATUS_WEIGHTS = {'UNDER_CONSTRUCTION': 0.7, 'READY_TO_MOVE': 0.3}
+FURNISHING_WEIGHTS = {'UNFURNISHED': 0.75, 'SEMI_FURNISHED': 0.18, 'FURNISHED': 0.07}
+CATEGORY_WEIGHTS = {'STANDALONE': 0.7, 'TOWNSHIP': 0.16, 'COMPLEX': 0.14}
+
+DEVELOPERS = [
+    'Godrej', 'Lodha', 'Kolte Patil', 'Pristine', 'Shapoorji', 'Sobha', 'Prestige',
+    'Vilas', 'Mahindra', 'Rohan', 'Paranjape', 'Kumar', 'Gera', 'Puraniks', 'Ashwini',
+    'Vascon', 'Majestique', 'Pride', 'Nyati', 'Runwal',
+]
+NAME_SUFFIXES = [
+    'Heights', 'Residency', 'Greens', 'Towers', 'Park', 'Gardens', 'Enclave',
+    'Vista', 'Meadows', 'Square', 'Avenue', 'Crest',
+]
+STREETS = ['Main Road', 'Station Road', 'Highway', 'Link Road', 'Ring Road', 'Nagar Road', 'Lane 4']
+
+
+def generate(out_dir, variants, seed=0, template_dir=None):
+    """
+    Write the four source CSVs with the given number of variant rows
+
+    Args:
+        out_dir (str): Directory to write to (created if missing)
+        variants (int): Rows in ProjectConfigurationVariant.csv
+        seed (int): Random seed
+        template_dir (str): Where free-text columns are sampled from, data/ by default
+
+    Returns:
+        str: out_dir
+    """
+    template_dir = template_dir or os.path.join(ROOT, 'data')
+    rng = np.random.default_rng(seed)
+    read = lambda name: pd.read_csv(os.path.join(template_dir, name), dtype=str, keep_default_na=False)
+    projects, addresses = read('project.csv'), read('ProjectAddress.csv')
+    configs, variant_rows = read('ProjectConfiguration.csv'), read('ProjectConfigurationVariant.csv')
+
+    n_projects = max(len(projects), variants // VARIANTS_PER_PROJECT)
+    n_configs = n_projects * CONFIGS_PER_PROJECT
+    project_ids = np.array([f"p{i}" for i in range(n_projects)], dtype=object)
+    config_ids = np.array([f"c{i}" for i in range(n_configs)], dtype=object)
+
+    # Where each project is, and what a square foot costs there
+    localities = [(city, locality) for city, _, _, _, _, names in CITIES for locality in names]
+    place = _choose(rng, n_projects, _locality_weights())
+    rates = np.array([rate for city, _, rate, _, _, names in CITIES for _ in names], dtype=np.float64)
+    premiums = rng.lognormal(0.0, 0.2, len(localities))
+    project_rate = (rates * premiums)[place]
+
+    P = _sample(projects, rng, n_projects)
+    P['id'] = project_ids
+    P['projectName'] = _project_names(rng, place, localities)
+    P['projectCategory'] = _weighted(rng, n_projects, CATEGORY_WEIGHTS)
+    P['status'] = _weighted(rng, n_projects, STATUS_WEIGHTS)
+    P['slug'] = [
+        f"{name.lower().replace(' ', '-')}-{localities[p][1].replace(' ', '-')}-{localities[p][0].lower()}-{i}"
+        for i, (name, p) in enumerate(zip(P['projectName'], place))
+    ]
+    P['slugId'] = ''
+
+    A = _sample(addresses, rng, n_projects)
+    A['id'] = [f"a{i}" for i in range(n_projects)]
+    A['projectId'] = project_ids
+    A['fullAddress'], A['landmark'], A['pincode'] = _addresses(rng, place, localities)
+
+    # Configurations belong to consecutive projects; BHK drives area and price
+    C = _sample(configs, rng, n_configs)
+    C['id'] = config_ids
+    C['projectId'] = np.repeat(project_ids, CONFIGS_PER_PROJECT)
+    config_bhk = np.array(list(BHK_WEIGHTS))[_choose(rng, n_configs, list(BHK_WEIGHTS.values()))]
+    types = np.char.add(config_bhk.astype(str), 'BHK').astype(object)
+    types[rng.random(n_configs) < UNTYPED_SHARE] = ''
+    C['type'] = types
+    C['customBHK'] = ''
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, table in (('project.csv', P), ('ProjectAddress.csv', A), ('ProjectConfiguration.csv', C)):
+        table.to_csv(os.path.join(out_dir, name), index=False)
+
+    # Written under a temporary name so an interrupted run is never reused
+    variant_path = os.path.join(out_dir, 'ProjectConfigurationVariant.csv')
+    partial_path = variant_path + '.partial'
+    config_rate = np.repeat(project_rate, CONFIGS_PER_PROJECT)
+    for start in range(0, variants, CHUNK_ROWS):
+        rows = min(CHUNK_ROWS, variants - start)
+        # One stream per chunk, so chunks do not depend on each other
+        chunk_rng = np.random.default_rng([seed, start // CHUNK_ROWS])
+        V = _variants(chunk_rng, variant_rows, start, rows, config_ids, config_bhk, config_rate)
+        V.to_csv(partial_path, index=False, mode='w' if start == 0 else 'a', header=start == 0)
+    if variants == 0:
+        variant_rows.iloc[:0].to_csv(partial_path, index=False)
+    os.replace(partial_path, variant_path)
+    return out_dir
+
+
+def _variants(rng, template, start, rows, config_ids, config_bhk, config_rate):
+    """One chunk of variant rows with ids start..start + rows"""
+    V = _sample(template, rng, rows)
+    config = rng.integers(0, len(config_ids), rows)
+    bhk = config_bhk[config]
+
+    area = np.array([CARPET_AREA[b] for b in BHK_WEIGHTS])[bhk - 1] * rng.lognormal(0.0, 0.12, rows)
+    price = config_rate[config] * area * rng.lognormal(0.0, 0.1, rows)
+
+    V['id'] = [f"v{i}" for i in range(start, start + rows)]
+    V['configurationId'] = config_ids[config]
+    V['carpetArea'] = np.round(area).astype(np.int64).astype(str)
+    # Nearest 50 thousand rupees, as listings quote them
+    V['price'] = (np.maximum(np.round(price / 50_000), 1).astype(np.int64) * 50_000).astype(str)
+    V['bathrooms'] = (bhk + (rng.random(rows) < 0.4)).astype(str)
+    V['balcony'] = rng.integers(0, bhk + 1).astype(str)
+    V['furnishedType'] = _weighted(rng, rows, FURNISHING_WEIGHTS)
+    return V
+
+
+def _locality_weights():
+    """Share of projects per (city, locality), long-tailed within each city"""
+    weights = []
+    for _, share, _, _, _, names in CITIES:
+        popularity = 1.0 / np.arange(1, len(names) + 1) ** 0.8
+        weights.extend(share * popularity / popularity.sum())
+    return weights
+
+
+def _project_names(rng, place, localities):
+    developers = np.array(DEVELOPERS, dtype=object)[rng.integers(0, len(DEVELOPERS), len(place))]
+    suffixes = np.array(NAME_SUFFIXES, dtype=object)[rng.integers(0, len(NAME_SUFFIXES), len(place))]
+    # A numbered phase keeps names selective for project filters and dedup keys
+    return [
+        f"{developer} {suffix} {localities[p][1].title()} {i % 97}"
+        for i, (developer, suffix, p) in enumerate(zip(developers, suffixes, place))
+    ]
+
+
+def _addresses(rng, place, localities):
+    """(fullAddress, landmark, pincode) columns for the projects at these places"""
+    states = {city: (state, prefix) for city, _, _, state, prefix, _ in CITIES}
+    plots = rng.integers(1, 400, len(place))
+    streets = rng.integers(0, len(STREETS), len(place))
+    unplaced = rng.random(len(place)) < UNPLACED_SHARE
+    full, landmark, pincode = [], [], []
+    for p, plot, street, hidden in zip(place.tolist(), plots.tolist(), streets.tolist(), unplaced.tolist()):
+        city, locality = localities[p]
+        state, prefix = states[city]
+        code = f"{prefix}{p % 100:03d}"
+        if hidden:
+            full.append(f"Plot {plot}, {STREETS[street]}")
+            landmark.append(f"Near sector {plot % 40}")
+        else:
+            full.append(f"Plot {plot}, {STREETS[street]}, {locality.title()}, {city}, {state} {code}")
+            landmark.append(f"Near {locality.title()} {STREETS[street]}")
+        pincode.append(code)
+    return full, landmark, pincode
+
+
+def _sample(table, rng, rows):
+    """Template rows drawn with replacement, for the columns not generated"""
+    return table.iloc[rng.integers(0, len(table), rows)].reset_index(drop=True)
+
+
+def _choose(rng, size, weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    return rng.choice(len(weights), size=size, p=weights / weights.sum())
+
+
+def _weighted(rng, size, weights):
+    return np.array(list(weights), dtype=object)[_choose(rng, size, list(weights.values()))]
+
+
+def cached(variants, seed=0):
+    """Generated catalogue under the temp dir, reused across benchmark runs"""
+    out_dir = os.path.join(tempfile.gettempdir(), f"property-bench-v{GENERATOR_VERSION}-{variants}-{seed}")
+    if not os.path.exists(os.path.join(out_dir, 'ProjectConfigurationVariant.csv')):
+        print(f"Generating {variants} synthetic variant rows in {out_dir}...")
+        generate(out_dir, variants, seed)
+    return out_dir
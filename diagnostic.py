@@ -9,6 +9,7 @@ import pandas as pd
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 from backend.data_loader import DataLoader
+from backend.logs import configure_logging
 from backend.query_parser import QueryParser
 from backend.search_engine import SearchEngine
 
@@ -26,37 +27,43 @@ def diagnose_data():
     
     print(f"\n✅ Loaded {len(df)} properties")
     
+    # Distributions come from the search engine's pre-aggregated cube
+    search_engine = SearchEngine(df)
+    cube = search_engine.cube
+    
     # Check cities
     print("\n2. Cities Available:")
-    cities = df['city'].value_counts()
-    for city, count in cities.items():
-        print(f"   - {city}: {count} properties")
+    cities = cube.breakdown('city')
+    missing_city = cities.pop(None, {'count': 0})['count']
+    for city, totals in cities.items():
+        print(f"   - {city}: {totals['count']} properties (avg ₹{totals['avg_price']:.2f} Cr)")
     
-    if df['city'].isna().sum() > 0:
-        print(f"   ⚠️  WARNING: {df['city'].isna().sum()} properties have no city!")
+    if missing_city > 0:
+        print(f"   ⚠️  WARNING: {missing_city} properties have no city!")
     
     # Check BHK distribution
     print("\n3. BHK Distribution:")
-    bhk_dist = df['bhk'].value_counts().sort_index()
-    for bhk, count in bhk_dist.items():
-        if not pd.isna(bhk):
-            print(f"   - {int(bhk)}BHK: {count} properties")
+    bhk_dist = cube.breakdown('bhk')
+    missing_bhk = bhk_dist.pop(None, {'count': 0})['count']
+    for bhk, totals in sorted(bhk_dist.items()):
+        print(f"   - {int(bhk)}BHK: {totals['count']} properties")
     
-    if df['bhk'].isna().sum() > 0:
-        print(f"   ⚠️  WARNING: {df['bhk'].isna().sum()} properties have no BHK!")
+    if missing_bhk > 0:
+        print(f"   ⚠️  WARNING: {missing_bhk} properties have no BHK!")
     
     # Check price range
     print("\n4. Price Range:")
-    print(f"   - Min: ₹{df['price_cr'].min():.2f} Cr")
-    print(f"   - Max: ₹{df['price_cr'].max():.2f} Cr")
-    print(f"   - Avg: ₹{df['price_cr'].mean():.2f} Cr")
+    overview = cube.totals()
+    print(f"   - Min: ₹{overview['min_price']:.2f} Cr")
+    print(f"   - Max: ₹{overview['max_price']:.2f} Cr")
+    print(f"   - Avg: ₹{overview['avg_price']:.2f} Cr")
+    # Medians do not add up across cells, so this one still reads the column
     print(f"   - Median: ₹{df['price_cr'].median():.2f} Cr")
     
     # Check status
     print("\n5. Possession Status:")
-    status_dist = df['status'].value_counts()
-    for status, count in status_dist.items():
-        print(f"   - {status}: {count} properties")
+    for status, totals in cube.breakdown('status').items():
+        print(f"   - {status}: {totals['count']} properties")
     
     # Check localities (from addresses)
     print("\n6. Top 10 Localities (from addresses):")
@@ -80,7 +87,6 @@ def diagnose_data():
     print("=" * 60)
     
     parser = QueryParser()
-    search_engine = SearchEngine(df)
     
     test_queries = [
         "Show me 3BHK in Mumbai",
@@ -109,10 +115,10 @@ def diagnose_data():
     # Recommendations
     print("\n📋 RECOMMENDATIONS:")
     
-    if df['city'].isna().sum() > 0:
+    if missing_city > 0:
         print("   ⚠️  Add city information to addresses")
     
-    if df['bhk'].isna().sum() > 0:
+    if missing_bhk > 0:
         print("   ⚠️  Ensure all configurations have BHK or bathroom count")
     
     if len(df) < 10:
@@ -125,4 +131,5 @@ def diagnose_data():
 
 if __name__ == '__main__':
     import pandas as pd
+    configure_logging()
     diagnose_data()
\ No newline at end of file
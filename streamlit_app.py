@@ -7,6 +7,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 
 from backend.data_loader import DataLoader
+from backend.logs import configure_logging
+from backend.metrics import Metrics
 from backend.query_parser import QueryParser
 from backend.search_engine import SearchEngine
 from backend.summarizer import Summarizer
@@ -114,41 +116,38 @@ st.markdown("""
 # Initialize session state
 if 'messages' not in st.session_state:
     st.session_state.messages = []
-if 'data_loaded' not in st.session_state:
-    st.session_state.data_loaded = False
-    st.session_state.df = None
 
-# Load data
-@st.cache_data
-def load_data():
+# Load data and build the backend once per process; every session and
+# rerun shares the same read-only frame, indexes and caches
+@st.cache_resource(show_spinner="Loading property data...")
+def load_backend():
+    configure_logging()
     loader = DataLoader(data_dir='data')
-    return loader.load_and_merge()
+    df = loader.get_data()
+    # Per-stage timings, switched on with PROPERTY_SEARCH_METRICS=1
+    metrics = Metrics(enabled=os.environ.get('PROPERTY_SEARCH_METRICS') == '1')
+    parser = QueryParser()
+    metrics.track_cache('parse', parser.cache)
+    return parser, SearchEngine(df, metrics=metrics), Summarizer(), metrics
 
-# Initialize components
-if not st.session_state.data_loaded:
-    with st.spinner("Loading property data..."):
-        st.session_state.df = load_data()
-        st.session_state.data_loaded = True
-
-parser = QueryParser()
-search_engine = SearchEngine(st.session_state.df)
-summarizer = Summarizer()
+parser, search_engine, summarizer, metrics = load_backend()
 
 # Header
 st.title("🏠 Property Search Assistant")
 st.markdown("Find your dream property")
 
-# Stats (only 3 metrics, removed Cities)
+# Stats (only 3 metrics, removed Cities), read from the pre-aggregated cube
+overview = search_engine.cube.totals()
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("📊 Total Properties", len(st.session_state.df))
+    st.metric("📊 Total Properties", overview['count'])
 
 with col2:
-    st.metric("💰 Avg Price", f"₹{st.session_state.df['price_cr'].mean():.2f} Cr")
+    st.metric("💰 Avg Price", f"₹{overview['avg_price']:.2f} Cr")
 
 with col3:
-    ready_count = len(st.session_state.df[st.session_state.df['status'].str.contains('Ready', na=False)])
+    ready_count = search_engine.cube.totals(status=lambda status: 'Ready' in status)['count']
     st.metric("🏗️ Ready to Move", ready_count)
 
 st.divider()
@@ -231,6 +230,11 @@ for message in st.session_state.messages:
                         </div>
                         """, unsafe_allow_html=True)
 
+# Pipeline timings, when enabled
+if metrics.enabled:
+    with st.expander("📈 Pipeline metrics"):
+        st.code(metrics.to_prometheus(), language='text')
+
 # Handle example query click
 if 'example_query' in st.session_state and st.session_state.example_query:
     user_query = st.session_state.example_query
@@ -247,7 +251,8 @@ if user_query:
     })
     
     # Parse query
-    filters = parser.parse(user_query)
+    with metrics.span('stage_seconds', stage='parse'):
+        filters = parser.parse(user_query)
     
     # Search
     results = search_engine.search(filters, top_n=10)
@@ -261,18 +266,18 @@ if user_query:
     stats = search_engine.get_statistics(results, filters)
     
     # Generate summary
-    summary = summarizer.generate_summary(results, filters, stats, expanded)
+    with metrics.span('stage_seconds', stage='generate_summary'):
+        summary = summarizer.generate_summary(results, filters, stats, expanded)
     
-    # Format property cards
-    property_cards = []
-    for _, row in results.iterrows():
-        property_cards.append(summarizer.format_property_card(row))
+    # Format property cards (only the ones shown)
+    with metrics.span('stage_seconds', stage='format_cards'):
+        property_cards = summarizer.format_property_cards(results.head(6))
     
     # Add bot response
     st.session_state.messages.append({
         'role': 'assistant',
         'content': summary,
-        'properties': property_cards[:6]
+        'properties': property_cards
     })
     
     # Rerun to update UI
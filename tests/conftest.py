@@ -0,0 +1,28 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(os.path.join(ROOT, 'benchmarks'))
+
+from synthetic import generate
+
+DATA_DIR = os.path.join(ROOT, 'data')
+
+
+@pytest.fixture(scope='session')
+def synthetic_dir(tmp_path_factory):
+    """A few thousand generated variant rows; treat as read-only"""
+    out_dir = tmp_path_factory.mktemp('synthetic')
+    generate(str(out_dir), 5000, seed=0)
+    return str(out_dir)
+
+
+@pytest.fixture
+def synthetic_copy(synthetic_dir, tmp_path):
+    """Private copy of the generated CSVs, free to edit"""
+    out_dir = tmp_path / 'data'
+    shutil.copytree(synthetic_dir, out_dir)
+    return str(out_dir)
@@ -0,0 +1,63 @@
+import os
+import re
+
+import pytest
+
+from backend.api import SearchAPI, TestClient
+from backend.service import SearchService
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+@pytest.fixture(scope='module')
+def client():
+    service = SearchService.from_data(DATA_DIR, use_snapshot=False)
+    with TestClient(SearchAPI(service, workers=1)) as client:
+        yield client
+
+
+def test_search_ok(client):
+    response = client.get('/search', q='2BHK in Pune', top_n=3)
+    assert response.status == 200
+    assert len(response.decoded()['results']) <= 3
+
+
+@pytest.mark.parametrize('q', [123, 1.5, ['3BHK'], {'city': 'Pune'}, True])
+def test_non_string_query_is_rejected(client, q):
+    for path in ('/search', '/stats', '/expand'):
+        response = client.post(path, {'q': q})
+        assert response.status == 400
+        assert 'q' in response.decoded()['error']
+
+
+@pytest.mark.parametrize('value', ['nan', 'NaN', 'inf', '-inf', 'Infinity'])
+def test_non_finite_budget_is_rejected(client, value):
+    assert client.get('/search', q='3BHK', budget_max=value).status == 400
+    assert client.post('/search', {'q': '3BHK', 'filters': {'budget_max': value}}).status == 400
+
+
+@pytest.mark.parametrize('name, value', [
+    ('city', '('), ('project_name', '['), ('locality', 'a)'), ('locality', '(.*.*)*#'), ('city', '*'),
+])
+def test_text_filters_are_plain_text(client, name, value):
+    response = client.get('/search', **{name: value})
+    assert response.status == 200
+    assert client.post('/stats', {'filters': {name: value}}).status == 200
+
+
+def test_regex_errors_are_bad_requests(client, monkeypatch):
+    def broken(*args):
+        raise re.error('bad pattern')
+    monkeypatch.setattr(client.api.service, 'search', broken)
+    assert client.get('/search', q='3BHK').status == 400
+
+
+@pytest.mark.parametrize('payload', [
+    {'filters': {'bhk': float('inf')}},
+    {'filters': {'bhk': float('nan')}},
+    {'bhk': float('-inf')},
+    {'top_n': float('inf')},
+    {'top_n': float('nan')},
+])
+def test_non_finite_integers_are_rejected(client, payload):
+    assert client.post('/search', {'q': '3BHK', **payload}).status == 400
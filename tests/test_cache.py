@@ -0,0 +1,34 @@
+import pandas as pd
+
+from backend.cache import ResultCache, estimate_size
+
+
+def catalogue(rows=150_000):
+    names = pd.Series([f"Project {i} Tower" for i in range(rows)], dtype='category')
+    return pd.DataFrame({'projectName': names, 'price_cr': range(rows)})
+
+
+def test_small_categorical_slice_is_sized_by_what_it_uses():
+    frame = catalogue()
+    page = frame.iloc[:10]
+    full = int(frame.memory_usage(deep=True).sum())
+    assert estimate_size(page) < 10_000
+    assert estimate_size(frame) > full // 2
+
+
+def test_cache_holds_many_small_results_of_a_large_catalogue():
+    frame = catalogue()
+    cache = ResultCache(max_entries=512, max_bytes=1024 * 1024)
+    for i in range(200):
+        cache.put(i, frame.iloc[i * 10:i * 10 + 10])
+    assert cache.stats()['entries'] == 200
+    assert cache.evictions == 0
+
+
+def test_disabled_cache_never_sizes_values(monkeypatch):
+    sized = []
+    monkeypatch.setattr('backend.cache.estimate_size', lambda value: sized.append(value) or 0)
+    cache = ResultCache(max_entries=0)
+    cache.put('key', catalogue(10))
+    assert sized == []
+    assert cache.get('key') == (False, None)
@@ -0,0 +1,76 @@
+import glob
+import os
+import tempfile
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from backend.data_loader import DataLoader
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+def scratch_dirs():
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), 'property-details-*')))
+
+
+def test_streaming_without_snapshot_removes_detail_files_on_close():
+    before = scratch_dirs()
+    loader = DataLoader(DATA_DIR, use_snapshot=False, chunksize=500)
+    df = loader.load_and_merge()
+    assert len(loader.get_details(df.index[:3])) == 3
+    assert scratch_dirs() - before
+
+    loader.close()
+    assert scratch_dirs() == before
+
+
+def test_streaming_detail_files_go_with_the_last_store():
+    before = scratch_dirs()
+    loader = DataLoader(DATA_DIR, use_snapshot=False, chunksize=500)
+    loader.load_and_merge()
+    del loader
+    assert scratch_dirs() == before
+
+
+@pytest.mark.parametrize('chunksize', [700, 100_000])
+def test_streaming_matches_the_in_memory_path(synthetic_dir, chunksize):
+    memory = DataLoader(synthetic_dir, use_snapshot=False)
+    streamed = DataLoader(synthetic_dir, use_snapshot=False, chunksize=chunksize)
+    assert_frame_equal(streamed.load_and_merge(), memory.load_and_merge())
+
+    labels = memory.df.index[::97].tolist()
+    assert_frame_equal(streamed.get_details(labels), memory.get_details(labels), check_dtype=False)
+    streamed.close()
+
+
+def test_removed_variants_stop_resolving_details(synthetic_copy):
+    loader = DataLoader(synthetic_copy, use_snapshot=False, chunksize=700)
+    df = loader.load_and_merge()
+    gone = df.index[df['id_variant'].isin(['v3', 'v4'])].tolist()
+    kept = df.index[df['id_variant'] == 'v5'].tolist()
+
+    path = os.path.join(synthetic_copy, 'ProjectConfigurationVariant.csv')
+    variants = pd.read_csv(path, dtype=str, keep_default_na=False)
+    variants[~variants['id'].isin(['v3', 'v4'])].to_csv(path, index=False)
+    change = loader.refresh()
+
+    assert sorted(change['removed'].tolist()) == sorted(gone)
+    assert len(loader.get_details(kept)) == len(kept)
+    for label in gone:
+        with pytest.raises(KeyError):
+            loader.get_details([label])
+    loader.close()
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_parallel_loading_matches_serial(synthetic_dir, monkeypatch, compact):
+    # Small enough for a test, large enough to be split across processes
+    monkeypatch.setattr('backend.data_loader.PARALLEL_MIN_ROWS', 1000)
+    serial = DataLoader(synthetic_dir, use_snapshot=False, compact=compact)
+    parallel = DataLoader(synthetic_dir, use_snapshot=False, compact=compact, workers=3)
+    assert_frame_equal(parallel.load_and_merge(), serial.load_and_merge())
+
+    labels = serial.df.index[::97].tolist()
+    assert_frame_equal(parallel.get_details(labels), serial.get_details(labels))
@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from backend.data_loader import DataLoader
+from backend.search_engine import SearchEngine
+
+FILTERS = [
+    {},
+    {'city': 'Pune'},
+    {'city': 'Mumbai', 'bhk': 2, 'budget_max': 1.5},
+    {'status': 'Ready To Move', 'budget_max': 0.8},
+    {'locality': 'Wakad'},
+]
+
+
+def rewrite_variants(data_dir):
+    """Change, add and delete variant rows, stamping them in several ISO 8601 forms"""
+    path = os.path.join(data_dir, 'ProjectConfigurationVariant.csv')
+    variants = pd.read_csv(path, dtype=str, keep_default_na=False)
+    variants.loc[0:9, 'price'] = (variants.loc[0:9, 'price'].astype(int) + 100_000).astype(str)
+    variants.loc[0:9, 'updatedAt'] = '2030-01-01 00:00:00'
+    variants.loc[10:19, 'carpetArea'] = '999'
+    variants.loc[10:19, 'updatedAt'] = '2030-01-02T03:04:05Z'
+    added = variants.loc[50:59].copy()
+    added['id'] = [f"new-{i}" for i in range(len(added))]
+    added['updatedAt'] = '2030-01-04T00:00:00+05:30'
+    pd.concat([variants.drop(index=range(30, 40)), added]).to_csv(path, index=False)
+
+
+def by_variant(df):
+    return df.sort_values(['id_variant', 'fullAddress']).reset_index(drop=True)
+
+
+def test_refresh_matches_a_full_reload(synthetic_copy):
+    loader = DataLoader(synthetic_copy, use_snapshot=False)
+    engine = SearchEngine(loader.get_data())
+    rewrite_variants(synthetic_copy)
+
+    change = loader.refresh()
+    engine.refresh(loader.df, change['upserted'], change['removed'])
+    fresh = DataLoader(synthetic_copy, use_snapshot=False).get_data()
+
+    # Changed rows get new labels, so compare row contents, not labels
+    assert len(change['upserted']) == 30
+    assert_frame_equal(by_variant(loader.df), by_variant(fresh))
+    assert loader.watermark == pd.Timestamp('2030-01-03 18:30:00')
+
+    rebuilt = SearchEngine(fresh)
+    for filters in FILTERS:
+        assert engine.facet_counts(filters) == rebuilt.facet_counts(filters)
+        assert engine.search(filters)['price_cr'].tolist() == rebuilt.search(filters)['price_cr'].tolist()
@@ -0,0 +1,154 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from backend.data_loader import DataLoader
+from backend.search_engine import DEDUP_COLUMNS, RESULT_COLUMNS, SearchEngine
+
+FILTERS = [
+    {'city': 'Pune'},
+    {'city': 'mumbai', 'bhk': 2},
+    {'city': 'Bangalore', 'bhk': 3, 'budget_max': 1.2},
+    # Not a city column value: falls back to the address
+    {'city': 'Wakad'},
+    {'city': 'Atlantis'},
+    {'bhk': 1, 'budget_max': 0.45},
+    {'budget_max': 0.3},
+    {'status': 'Ready To Move', 'budget_max': 0.9},
+    {'status': 'Under Construction', 'bhk': 4},
+    {'status': 'Sold Out'},
+    {'locality': 'Wakad'},
+    {'locality': 'Viman Nagar', 'bhk': 2, 'budget_max': 1.1},
+    {'locality': 'Dwarka'},
+    {'locality': 'Whitefield', 'status': 'Ready To Move'},
+    {'project_name': 'Godrej'},
+    {'project_name': 'Kolte Patil Greens'},
+    {'project_name': 'Sobha', 'city': 'Pune', 'bhk': 3},
+    {'project_name': 'Nowhere Towers'},
+    {'city': 'Pune', 'bhk': 2, 'budget_max': 0.9, 'status': 'Ready To Move', 'locality': 'Baner'},
+]
+
+
+def reference_search(df, filters, top_n=10):
+    """
+    The original pandas implementation of SearchEngine.search, with the
+    text filters as plain substrings (regex=False)
+
+    The original sorted with the default quicksort, so rows of equal price
+    came out in no particular order; the indexes keep catalogue order for
+    ties, which is what kind='stable' gives here.
+    """
+    contains = lambda column, text: df[column].astype(object).str.contains(text, case=False, na=False, regex=False)
+    mask = pd.Series(True, index=df.index)
+    if filters.get('city'):
+        city = contains('city', filters['city'])
+        mask &= city if city.any() else contains('fullAddress', filters['city'])
+    if filters.get('bhk'):
+        mask &= (df['bhk'] >= filters['bhk'] - 0.5) & (df['bhk'] <= filters['bhk'] + 0.5)
+    if filters.get('budget_max'):
+        mask &= df['price_cr'] <= filters['budget_max']
+    if filters.get('status'):
+        status = filters['status'].lower()
+        if 'ready' in status:
+            mask &= contains('status', 'Ready')
+        elif 'construction' in status or 'under' in status:
+            mask &= contains('status', 'Construction')
+    if filters.get('locality'):
+        mask &= contains('fullAddress', filters['locality']) | contains('landmark', filters['locality'])
+    if filters.get('project_name'):
+        mask &= contains('projectName', filters['project_name'])
+
+    results = df[mask].sort_values('price_cr', kind='stable')
+    return results.drop_duplicates(subset=DEDUP_COLUMNS, keep='first').head(top_n)
+
+
+def reference_expand(df, filters):
+    """The original expand_search: relax locality, status, budget (+20%), then BHK"""
+    relaxed = dict(filters)
+    for name in ('locality', 'status', 'budget_max', 'bhk'):
+        if not relaxed.get(name):
+            continue
+        relaxed[name] = relaxed[name] * 1.2 if name == 'budget_max' else None
+        results = reference_search(df, relaxed)
+        if not results.empty:
+            return results, 'budget' if name == 'budget_max' else name
+    return pd.DataFrame(), None
+
+
+def assert_same_rows(actual, expected):
+    columns = [c for c in RESULT_COLUMNS if c in actual.columns]
+    assert_frame_equal(actual[columns], expected[columns], check_categorical=False)
+
+
+@pytest.fixture(scope='module')
+def catalogue(synthetic_dir):
+    return DataLoader(synthetic_dir, use_snapshot=False).get_data()
+
+
+@pytest.fixture(scope='module')
+def engine(catalogue):
+    return SearchEngine(catalogue, cache_entries=0)
+
+
+@pytest.mark.parametrize('filters', FILTERS, ids=str)
+def test_search_matches_pandas_filtering(catalogue, engine, filters):
+    assert_same_rows(engine.search(filters), reference_search(catalogue, filters))
+
+
+@pytest.mark.parametrize('top_n', [1, 3, 10, 250, 10_000])
+@pytest.mark.parametrize('filters', [{}, {'city': 'Pune', 'bhk': 2}, {'locality': 'Wakad'}], ids=str)
+def test_top_n_stops_at_the_same_rows(catalogue, engine, filters, top_n):
+    assert_same_rows(engine.search(filters, top_n=top_n), reference_search(catalogue, filters, top_n))
+
+
+def test_budget_cutoff_includes_rows_priced_exactly_at_the_budget(catalogue, engine):
+    prices = catalogue['price_cr'].dropna().drop_duplicates().sort_values()
+    for budget in prices.iloc[[0, 1, len(prices) // 3, len(prices) // 2, -1]].tolist():
+        filters = {'budget_max': budget, 'city': 'Mumbai'}
+        assert_same_rows(engine.search(filters, top_n=50), reference_search(catalogue, filters, 50))
+
+
+@pytest.mark.parametrize('filters', [
+    {'city': 'Pune', 'locality': 'Dwarka', 'bhk': 2},
+    {'city': 'Mumbai', 'status': 'Ready To Move', 'budget_max': 0.05},
+    {'project_name': 'Sobha Vista', 'status': 'Ready To Move', 'budget_max': 0.8},
+    {'project_name': 'Runwal Avenue', 'status': 'Ready To Move', 'budget_max': 0.8},
+    {'project_name': 'Sobha Vista', 'status': 'Ready To Move', 'budget_max': 0.8, 'bhk': 1},
+    {'city': 'Pune', 'bhk': 5, 'budget_max': 0.2},
+    {'project_name': 'Nowhere Towers', 'bhk': 2},
+    {'locality': 'Wakad', 'bhk': 2},
+], ids=str)
+def test_expand_search_relaxes_like_repeated_searches(catalogue, engine, filters):
+    results, relaxed = engine.expand_search(filters)
+    expected, expected_relaxed = reference_expand(catalogue, filters)
+    assert relaxed == expected_relaxed
+    if expected.empty:
+        assert results.empty
+    else:
+        assert_same_rows(results, expected)
+
+
+@pytest.mark.parametrize('top_n', [1, 10, 40])
+def test_search_many_matches_a_loop_of_search(engine, top_n):
+    # Budget variants of each filter set share a group inside search_many
+    batch = FILTERS + [
+        {**filters, 'budget_max': budget}
+        for filters in FILTERS[:8]
+        for budget in (None, 0.4, 0.75, 1.3, 5.0)
+    ]
+    for filters, labels in zip(batch, engine.search_many(batch, top_n=top_n)):
+        assert labels.tolist() == engine.search(filters, top_n=top_n).index.tolist()
+
+
+def test_disabled_cache_hands_out_results_without_copying(catalogue, monkeypatch):
+    copies = []
+    monkeypatch.setattr('backend.search_engine.copy.deepcopy', lambda value: copies.append(value) or value)
+    engine = SearchEngine(catalogue, cache_entries=0)
+    engine.search({'city': 'Pune'})
+    engine.expand_search({'city': 'Pune', 'locality': 'Dwarka'})
+    engine.facet_counts({'city': 'Pune'})
+    assert copies == []
+
+    cached = SearchEngine(catalogue)
+    cached.search({'city': 'Pune'})
+    assert len(copies) == 1
@@ -0,0 +1,55 @@
+import os
+import shutil
+
+import pytest
+
+from backend.data_loader import SOURCE_FILES, DataLoader
+from backend.snapshot import SnapshotStore
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+
+@pytest.fixture
+def loader(tmp_path):
+    for name in SOURCE_FILES:
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path)
+    loader = DataLoader(str(tmp_path))
+    loader.load_and_merge()
+    return loader
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    paths = []
+    hash_file = SnapshotStore._hash_file
+    monkeypatch.setattr(SnapshotStore, '_hash_file', staticmethod(lambda path: paths.append(path) or hash_file(path)))
+    return paths
+
+
+def is_fresh(loader):
+    return loader.snapshot.is_fresh(loader.source_paths(), layout=loader.layout)
+
+
+def test_unchanged_sources_are_not_hashed(loader, hashed):
+    assert is_fresh(loader)
+    assert hashed == []
+
+
+def test_touched_source_is_hashed_once(loader, hashed):
+    path = loader.source_paths()[0]
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert is_fresh(loader)
+    assert hashed == [path]
+    assert is_fresh(loader)
+    assert hashed == [path]
+
+
+def test_rewritten_source_of_the_same_size_is_stale(loader, hashed):
+    path = loader.source_paths()[0]
+    with open(path, 'r+b') as f:
+        first = f.read(1)
+        f.seek(0)
+        f.write(b'#' if first != b'#' else b'$')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert not is_fresh(loader)